@@ -1,14 +1,24 @@
 """Analytics endpoints."""
 
+import asyncio
+import logging
+from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
-from app.core.database import get_db
+from app.api.dependencies import get_analytics_read_db, get_current_analytics_user
+from app.api.etag import etag_headers, etag_matches, not_modified, weak_etag
+from app.core.cache import cache_hget, cache_hset, cache_lock
+from app.core.config import settings
+from app.core.database import get_analytics_db, get_read_session_factory
+from app.core.serialization import type_adapter
 from app.models.analytics import AnalyticsSnapshot
 from app.models.community import Community
 from app.models.user import User
@@ -23,34 +33,111 @@ from app.schemas.analytics import (
     RecommendationsResponse,
     SubscriberDynamics,
 )
+from app.services.analytics_export import EXPORT_MEDIA_TYPES, snapshots_export_query, stream_snapshots
+from app.services.timeseries import epoch_seconds, fetch_metric_series, linear_trend, lttb_indices
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
-@router.get("/dashboard", response_model=DashboardResponse)
-async def get_dashboard(
-    date_from: datetime | None = Query(None, description="Start date for metrics (ISO 8601)"),
-    date_to: datetime | None = Query(None, description="End date for metrics (ISO 8601)"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """Get dashboard analytics for all user's communities."""
-    # Set default date range (30 days ago to now)
-    now = datetime.now(timezone.utc)
+def dashboard_version_query(user_id: UUID) -> Select:
+    """
+    Version of a user's dashboard: active community count, their last update,
+    ingest watermark and snapshot sequence.
+
+    The watermark is read from idx_analytics_snapshots_latest; the sequence, kept
+    on the community rows by a trigger, catches snapshots backfilled behind it.
+    """
+    latest_snapshot = (
+        select(func.max(AnalyticsSnapshot.recorded_at))
+        .where(AnalyticsSnapshot.community_id == Community.id)
+        .correlate(Community)
+        .scalar_subquery()
+    )
+    return select(
+        func.count(Community.id),
+        func.max(Community.updated_at),
+        func.max(latest_snapshot),
+        func.coalesce(func.sum(Community.snapshot_sequence), 0),
+    ).where(
+        Community.user_id == user_id,
+        Community.deleted_at.is_(None),
+        Community.is_active == True,
+    )
+
+
+def dashboard_etag(
+    user_id: UUID,
+    version: Sequence,
+    date_from: datetime,
+    date_to: datetime,
+    as_of: datetime,
+) -> str:
+    """Weak ETag of a dashboard response from its version row, (quantized) window and as-of hour."""
+    community_count, communities_updated_at, ingest_watermark, snapshot_sequence = version
+    return weak_etag(
+        user_id, community_count, communities_updated_at, ingest_watermark, snapshot_sequence, date_from, date_to, as_of
+    )
+
+
+def _floor_to(value: datetime, bucket: timedelta) -> datetime:
+    seconds = bucket.total_seconds()
+    return datetime.fromtimestamp(value.timestamp() // seconds * seconds, timezone.utc)
+
+
+def dashboard_as_of(now: datetime) -> datetime:
+    """
+    Hour the account health of a dashboard is computed for.
+
+    Token expiry and "synced within 7 days" depend on the current time, so cached
+    entries are versioned by this hour as well as by their data.
+    """
+    return _floor_to(now, timedelta(hours=1))
+
+
+def dashboard_window(
+    date_from: datetime | None,
+    date_to: datetime | None,
+    now: datetime,
+) -> tuple[datetime, datetime]:
+    """
+    Dashboard window (default: last 30 days) quantized to UTC hour or day buckets.
+
+    The start is floored and the end ceiled, so a window never loses data and the
+    sliding default window maps to one cache entry per hour.
+    """
     if date_to is None:
         date_to = now
     if date_from is None:
         date_from = date_to - timedelta(days=30)
-
-    # Get all active communities for user
-    communities_result = await db.execute(
-        select(Community).where(
-            Community.user_id == current_user.id,
-            Community.deleted_at.is_(None),
-            Community.is_active == True,
-        )
+    date_from, date_to = (
+        value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc) for value in (date_from, date_to)
     )
-    communities = communities_result.scalars().all()
+
+    if date_to - date_from >= timedelta(days=settings.dashboard_day_bucket_min_days):
+        bucket = timedelta(days=1)
+    else:
+        bucket = timedelta(hours=1)
+    end = _floor_to(date_to, bucket)
+    if end < date_to:
+        end += bucket
+    return _floor_to(date_from, bucket), end
+
+
+async def build_dashboard(
+    db: AsyncSession,
+    communities: Sequence[Community],
+    date_from: datetime | None,
+    date_to: datetime | None,
+    now: datetime,
+) -> DashboardResponse:
+    """Dashboard of the given active communities over a window (default: last 30 days)."""
+    # Set default date range (30 days ago to now)
+    if date_to is None:
+        date_to = now
+    if date_from is None:
+        date_from = date_to - timedelta(days=30)
 
     # Get latest metrics for each community
     community_metrics_list = []
@@ -209,16 +296,262 @@ async def get_dashboard(
     )
 
 
+def dashboard_cache_key(user_id: UUID) -> str:
+    """Redis hash holding a user's cached dashboard responses, one field per window."""
+    return f"dashboard:{user_id}"
+
+
+# Background refreshes of stale entries (referenced until done)
+_dashboard_refreshes: set[asyncio.Task] = set()
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return None if value is None else value.isoformat()
+
+
+def _entry_is_servable_stale(entry: dict, version: Sequence) -> bool:
+    """Same communities, and the entry's data lags the ingest watermark by at most the stale window."""
+    community_count, communities_updated_at, ingest_watermark, _ = version
+    if entry["communities"] != [community_count, _isoformat(communities_updated_at)]:
+        return False
+    if entry["watermark"] is None or ingest_watermark is None:
+        return False
+    lag = ingest_watermark - datetime.fromisoformat(entry["watermark"])
+    return lag <= timedelta(seconds=settings.dashboard_cache_stale_seconds)
+
+
+async def _compute_dashboard(
+    db: AsyncSession,
+    user_id: UUID,
+    version: Sequence,
+    date_from: datetime,
+    date_to: datetime,
+    now: datetime,
+    communities: Sequence[Community] | None = None,
+) -> bytes:
+    """Build a dashboard, store it in the cache tagged with its version and return its JSON."""
+    if communities is None:
+        communities_result = await db.execute(
+            select(Community).where(
+                Community.user_id == user_id,
+                Community.deleted_at.is_(None),
+                Community.is_active == True,
+            )
+        )
+        communities = communities_result.scalars().all()
+    as_of = dashboard_as_of(now)
+    dashboard = await build_dashboard(db, communities, date_from, date_to, as_of)
+    payload = type_adapter(DashboardResponse).dump_json(dashboard)
+
+    community_count, communities_updated_at, ingest_watermark, _ = version
+    header = orjson.dumps(
+        {
+            "etag": dashboard_etag(user_id, version, date_from, date_to, as_of),
+            "communities": [community_count, _isoformat(communities_updated_at)],
+            "watermark": _isoformat(ingest_watermark),
+        }
+    )
+    await cache_hset(
+        dashboard_cache_key(user_id),
+        f"{date_from.isoformat()}|{date_to.isoformat()}",
+        header + b"\n" + payload,
+        settings.dashboard_cache_ttl_seconds,
+    )
+    return payload
+
+
+async def _refresh_dashboard(user_id: UUID, date_from: datetime, date_to: datetime) -> None:
+    """Recompute a stale entry on its own session; one refresh per entry at a time."""
+    lock_key = f"{dashboard_cache_key(user_id)}:refresh:{date_from.isoformat()}|{date_to.isoformat()}"
+    if not await cache_lock(lock_key, settings.dashboard_cache_refresh_lock_seconds):
+        return
+    try:
+        session_factory = await get_read_session_factory(user_id, workload="analytics")
+        async with session_factory() as db:
+            version = (await db.execute(dashboard_version_query(user_id))).one()
+            await _compute_dashboard(db, user_id, version, date_from, date_to, datetime.now(timezone.utc))
+    except Exception as e:
+        logger.error(f"[DASHBOARD] Background refresh failed for user {user_id}: {e}")
+
+
+async def cached_dashboard(
+    db: AsyncSession,
+    user_id: UUID,
+    version: Sequence,
+    date_from: datetime,
+    date_to: datetime,
+    now: datetime,
+    communities: Sequence[Community] | None = None,
+) -> tuple[bytes, str]:
+    """
+    Dashboard JSON and its ETag for a quantized window, served from Redis when possible.
+
+    Entries carry the version row and as-of hour they were computed for, so new or
+    backfilled snapshots of any of the user's communities, a change of the
+    community set or the next hour (account health) invalidate them. During ingest
+    bursts or at the turn of the hour an entry whose watermark lags by at most
+    dashboard_cache_stale_seconds is served with its own ETag while a background
+    task recomputes it (stale-while-revalidate).
+    """
+    etag = dashboard_etag(user_id, version, date_from, date_to, dashboard_as_of(now))
+    cached = await cache_hget(dashboard_cache_key(user_id), f"{date_from.isoformat()}|{date_to.isoformat()}")
+    if cached is not None:
+        header, payload = cached.split(b"\n", 1)
+        entry = orjson.loads(header)
+        if entry["etag"] == etag:
+            return payload, etag
+        if _entry_is_servable_stale(entry, version):
+            task = asyncio.create_task(_refresh_dashboard(user_id, date_from, date_to))
+            _dashboard_refreshes.add(task)
+            task.add_done_callback(_dashboard_refreshes.discard)
+            return payload, entry["etag"]
+
+    payload = await _compute_dashboard(db, user_id, version, date_from, date_to, now, communities)
+    return payload, etag
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    date_from: datetime | None = Query(None, description="Start date for metrics (ISO 8601)"),
+    date_to: datetime | None = Query(None, description="End date for metrics (ISO 8601)"),
+    if_none_match: str | None = Header(None),
+    current_user: User = Depends(get_current_analytics_user),
+    db: AsyncSession = Depends(get_analytics_read_db),
+):
+    """
+    Get dashboard analytics for all user's communities.
+
+    The window is quantized to hour or day buckets (see dashboard_window). Sends a
+    weak ETag over the community set, the last ingest watermark (latest snapshot of
+    any of them, read from the per-community index), the snapshot sequence, the window
+    and the current hour; the computed
+    response is cached under the same version (see cached_dashboard).
+    """
+    now = datetime.now(timezone.utc)
+    date_from, date_to = dashboard_window(date_from, date_to, now)
+
+    version_result = await db.execute(dashboard_version_query(current_user.id))
+    version = version_result.one()
+    etag = dashboard_etag(current_user.id, version, date_from, date_to, dashboard_as_of(now))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    payload, etag = await cached_dashboard(db, current_user.id, version, date_from, date_to, now)
+    return Response(content=payload, media_type="application/json", headers=etag_headers(etag))
+
+
+@router.get("/export")
+async def export_analytics(
+    export_format: str = Query("parquet", alias="format", description="parquet or arrow"),
+    community_ids: list[UUID] | None = Query(None, description="Communities to export (default: all)"),
+    metrics: list[str] | None = Query(None, description="Metric names to export (default: all)"),
+    date_from: datetime | None = Query(None, description="Start date (ISO 8601)"),
+    date_to: datetime | None = Query(None, description="End date (ISO 8601)"),
+    current_user: User = Depends(get_current_analytics_user),
+    db: AsyncSession = Depends(get_analytics_db),
+):
+    """
+    Export raw analytics snapshots as Parquet or an Arrow IPC stream.
+
+    Columns: community_id, metric_name (dictionary encoded), recorded_at (UTC),
+    metric_value. The file is encoded batch by batch from a server-side cursor;
+    only the cursor's connection is held while streaming.
+    """
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}",
+        )
+
+    now = datetime.now(timezone.utc)
+    if date_to is None:
+        date_to = now
+    if date_from is None:
+        date_from = date_to - timedelta(days=30)
+    if date_from > date_to or date_to - date_from > timedelta(days=settings.analytics_export_max_days):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must be positive and at most {settings.analytics_export_max_days} days",
+        )
+
+    session_factory = await get_read_session_factory(current_user.id, workload="analytics")
+    async with session_factory() as db:
+        query = select(Community.id).where(
+            Community.user_id == current_user.id,
+            Community.deleted_at.is_(None),
+        )
+        if community_ids:
+            query = query.where(Community.id.in_(community_ids))
+        owned_ids = list((await db.execute(query)).scalars().all())
+
+    if community_ids and len(owned_ids) != len(set(community_ids)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more communities not found",
+        )
+
+    # Authentication is done; yield dependencies are torn down only after the last
+    # chunk, so return its connection to the pool for the download's lifetime
+    await db.close()
+
+    filename = f"analytics-{date_from:%Y%m%d}-{date_to:%Y%m%d}.{export_format}"
+    return StreamingResponse(
+        stream_snapshots(
+            session_factory,
+            snapshots_export_query(owned_ids, metrics, date_from, date_to),
+            export_format,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def metric_detail(
+    metric_name: str,
+    recorded_at: np.ndarray,
+    values: np.ndarray,
+    max_points: int | None = None,
+) -> CommunityMetricDetail:
+    """
+    Metric detail of one time-ordered series: trend over all points, values optionally downsampled.
+
+    recorded_at holds UTC instants without a zone (datetime64 has none); the
+    returned timestamps are UTC-aware again so they serialize with "Z".
+    """
+    x = epoch_seconds(recorded_at)
+    trend, change_percent = linear_trend(x, values)
+    indices = lttb_indices(x, values, max_points) if max_points else np.arange(len(values))
+    return CommunityMetricDetail(
+        metric_name=metric_name,
+        values=[
+            MetricValue(value=value, recorded_at=timestamp.replace(tzinfo=timezone.utc))
+            for value, timestamp in zip(values[indices].tolist(), recorded_at[indices].tolist(), strict=True)
+        ],
+        total_points=len(values),
+        trend=trend,
+        change_percent=round(change_percent, 2),
+    )
+
+
 @router.get("/communities/{community_id}", response_model=CommunityAnalyticsResponse)
 async def get_community_analytics(
     community_id: UUID,
     date_from: datetime | None = Query(None, description="Start date (ISO 8601)"),
     date_to: datetime | None = Query(None, description="End date (ISO 8601)"),
     metric: str | None = Query(None, description="Filter by metric name"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    max_points: int | None = Query(
+        None, ge=3, le=10000, description="Downsample each series to at most this many points (LTTB)"
+    ),
+    current_user: User = Depends(get_current_analytics_user),
+    db: AsyncSession = Depends(get_analytics_read_db),
 ):
-    """Get detailed analytics for a specific community."""
+    """
+    Get detailed analytics for a specific community.
+
+    Trends come from a least-squares fit over every point of the period; with
+    `max_points`, the returned values of each series are downsampled with
+    Largest-Triangle-Three-Buckets, which keeps its visual shape (peaks, dips).
+    """
     # Verify community belongs to user
     community_result = await db.execute(
         select(Community).where(
@@ -242,61 +575,12 @@ async def get_community_analytics(
     if date_from is None:
         date_from = date_to - timedelta(days=30)
 
-    # Build query for snapshots
-    query = select(AnalyticsSnapshot).where(
-        AnalyticsSnapshot.community_id == community_id,
-        AnalyticsSnapshot.recorded_at >= date_from,
-        AnalyticsSnapshot.recorded_at <= date_to,
-    )
-
-    if metric:
-        query = query.where(AnalyticsSnapshot.metric_name == metric)
-
-    result = await db.execute(query.order_by(AnalyticsSnapshot.metric_name, AnalyticsSnapshot.recorded_at))
-    snapshots = result.scalars().all()
-
-    # Group snapshots by metric_name
-    metrics_dict: dict[str, list[AnalyticsSnapshot]] = {}
-    for snapshot in snapshots:
-        if snapshot.metric_name not in metrics_dict:
-            metrics_dict[snapshot.metric_name] = []
-        metrics_dict[snapshot.metric_name].append(snapshot)
-
-    # Build metric details with trends
-    metric_details = []
-    for metric_name, metric_snapshots in metrics_dict.items():
-        # Sort by recorded_at
-        metric_snapshots.sort(key=lambda x: x.recorded_at)
-
-        values = [
-            MetricValue(value=float(snapshot.metric_value), recorded_at=snapshot.recorded_at)
-            for snapshot in metric_snapshots
-        ]
-
-        # Calculate trend and change_percent
-        if len(values) >= 2:
-            first_value = values[0].value
-            last_value = values[-1].value
-            change_percent = ((last_value - first_value) / first_value * 100) if first_value != 0 else 0.0
-
-            if change_percent > 1.0:
-                trend = "up"
-            elif change_percent < -1.0:
-                trend = "down"
-            else:
-                trend = "stable"
-        else:
-            change_percent = 0.0
-            trend = "stable"
-
-        metric_details.append(
-            CommunityMetricDetail(
-                metric_name=metric_name,
-                values=values,
-                trend=trend,
-                change_percent=round(change_percent, 2),
-            )
-        )
+    # Metric columns straight into arrays (no ORM objects), trends computed per series
+    series = await fetch_metric_series(db, community_id, date_from, date_to, metric)
+    metric_details = [
+        metric_detail(metric_name, recorded_at, values, max_points)
+        for metric_name, (recorded_at, values) in series.items()
+    ]
 
     return CommunityAnalyticsResponse(
         community={
@@ -315,8 +599,8 @@ async def get_community_analytics(
 @router.post("/communities/{community_id}/refresh")
 async def refresh_community_analytics(
     community_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_analytics_user),
+    db: AsyncSession = Depends(get_analytics_db),
 ):
     """Manually trigger analytics refresh for a community."""
     # Verify community belongs to user
@@ -352,8 +636,8 @@ async def refresh_community_analytics(
 
 @router.get("/recommendations", response_model=RecommendationsResponse)
 async def get_recommendations(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_analytics_user),
+    db: AsyncSession = Depends(get_analytics_read_db),
 ):
     """Get AI-generated recommendations (if available)."""
     # Check if we have enough data (at least 7 days of snapshots)
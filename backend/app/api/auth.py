@@ -120,7 +120,7 @@ async def forgot_password(
         # Create reset URL (frontend will handle the reset page)
         reset_url = f"{settings.frontend_url}/reset-password?token={reset_token}"
         
-        # Send email
+        # Queue email (delivery happens in the background sender)
         await send_password_reset_email(user.email, reset_token, reset_url)
     
     return {
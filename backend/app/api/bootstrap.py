@@ -0,0 +1,161 @@
+"""Bootstrap endpoint: the SPA's first-paint data in one request."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import TypeVar
+from uuid import UUID
+
+import orjson
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.analytics import cached_dashboard, dashboard_version_query, dashboard_window
+from app.api.calendar import calendar_month, user_timezone
+from app.api.communities import communities_etag
+from app.api.dependencies import get_current_user, get_read_db
+from app.api.etag import REVALIDATE_CACHE_CONTROL
+from app.core.database import get_read_session_factory
+from app.core.serialization import document_list_json, json_object, type_adapter
+from app.models.community import Community
+from app.models.post import PostReadModel
+from app.models.user import User
+from app.schemas.bootstrap import BootstrapResponse
+from app.schemas.calendar import CalendarResponse
+from app.schemas.community import CommunityListResponse, CommunityResponse
+from app.schemas.user import UserResponse
+from app.services.post_read_model import document_json
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+# First pages as the SPA requests them (endpoint defaults)
+COMMUNITIES_PAGE_SIZE = 20
+SCHEDULED_POSTS_PAGE_SIZE = 20
+
+# The profile only changes through PATCH /users/me by the same client
+USER_CACHE_CONTROL = "private, max-age=300"
+
+T = TypeVar("T")
+
+
+def _pagination(total: int, page_size: int) -> dict:
+    return {
+        "page": 1,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": (total + page_size - 1) // page_size if total > 0 else 0,
+    }
+
+
+async def _on_own_session(user_id: UUID, workload: str, build: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """Run a section on its own read session, so sections query concurrently."""
+    session_factory = await get_read_session_factory(user_id, workload=workload)
+    async with session_factory() as db:
+        return await build(db)
+
+
+async def _scheduled_posts(db: AsyncSession, user_id: UUID) -> bytes:
+    """First page of GET /posts?status=scheduled, from the post read model."""
+    conditions = (PostReadModel.user_id == user_id, PostReadModel.status == "scheduled")
+    total_result = await db.execute(select(func.count()).select_from(PostReadModel).where(*conditions))
+    documents_result = await db.execute(
+        select(document_json())
+        .where(*conditions)
+        .order_by(PostReadModel.created_at.desc())
+        .limit(SCHEDULED_POSTS_PAGE_SIZE)
+    )
+    return document_list_json(
+        documents_result.scalars().all(),
+        _pagination(total_result.scalar_one(), SCHEDULED_POSTS_PAGE_SIZE),
+    )
+
+
+@router.get("", response_model=BootstrapResponse)
+async def get_bootstrap(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Everything the SPA loads after login: profile, communities, dashboard, current
+    calendar month and scheduled posts (the last two for the extended tier only).
+
+    The user is authenticated once and the community set is loaded once; the
+    dashboard, calendar and post sections then run concurrently, each on its own
+    read session. `cache` carries each section's ETag and Cache-Control as its own
+    endpoint sends them, so the client can revalidate sections individually.
+    """
+    user_id = current_user.id
+    now = datetime.now(timezone.utc)
+    extended = current_user.subscription_tier == "extended"
+
+    # Dashboard version first, so its ETag never claims data newer than the section
+    dashboard_version = (await db.execute(dashboard_version_query(user_id))).one()
+    communities_result = await db.execute(
+        select(Community)
+        .where(Community.user_id == user_id, Community.deleted_at.is_(None))
+        .order_by(Community.created_at.desc())
+    )
+    communities = communities_result.scalars().all()
+    # Return the connection before the sections check out their own
+    await db.commit()
+
+    date_from, date_to = dashboard_window(None, None, now)
+    active_communities = [c for c in communities if c.is_active]
+    sections = [
+        _on_own_session(
+            user_id,
+            "analytics",
+            lambda session: cached_dashboard(
+                session, user_id, dashboard_version, date_from, date_to, now, active_communities
+            ),
+        )
+    ]
+    if extended:
+        tz = user_timezone(current_user)
+        local_now = now.astimezone(tz)
+        sections.append(
+            _on_own_session(
+                user_id,
+                "interactive",
+                lambda session: calendar_month(session, user_id, tz, local_now.year, local_now.month),
+            )
+        )
+        sections.append(
+            _on_own_session(user_id, "interactive", lambda session: _scheduled_posts(session, user_id))
+        )
+    (dashboard, dashboard_etag), *extended_sections = await asyncio.gather(*sections)
+    calendar, scheduled_posts = extended_sections or (None, None)
+
+    communities_page = CommunityListResponse(
+        data=[CommunityResponse.model_validate(c) for c in communities[:COMMUNITIES_PAGE_SIZE]],
+        pagination=_pagination(len(communities), COMMUNITIES_PAGE_SIZE),
+    )
+    last_updated_at = max((c.updated_at for c in communities), default=None)
+    revalidate = {"etag": None, "cache_control": REVALIDATE_CACHE_CONTROL}
+    cache = {
+        "user": {"etag": None, "cache_control": USER_CACHE_CONTROL},
+        "communities": {
+            "etag": communities_etag(user_id, len(communities), last_updated_at),
+            "cache_control": REVALIDATE_CACHE_CONTROL,
+        },
+        "dashboard": {
+            "etag": dashboard_etag,
+            "cache_control": REVALIDATE_CACHE_CONTROL,
+        },
+        "calendar": revalidate,
+        "scheduled_posts": revalidate,
+    }
+
+    body = json_object(
+        {
+            "user": type_adapter(UserResponse).dump_json(UserResponse.model_validate(current_user)),
+            "communities": type_adapter(CommunityListResponse).dump_json(communities_page),
+            "dashboard": dashboard,
+            "calendar": b"null" if calendar is None else type_adapter(CalendarResponse).dump_json(calendar),
+            "scheduled_posts": b"null" if scheduled_posts is None else scheduled_posts,
+            "cache": orjson.dumps(cache),
+        }
+    )
+    # A one-off snapshot of several resources; the sections carry their own validators
+    return Response(content=body, media_type="application/json", headers={"Cache-Control": "private, no-store"})
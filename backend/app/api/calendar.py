@@ -1,19 +1,38 @@
 """Calendar endpoints."""
 
-from calendar import monthrange
-from datetime import datetime, timezone
+import secrets
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import sha256
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import Date, Select, String, and_, cast, func, literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
-from app.core.database import get_db
+from app.api.dependencies import get_current_user, get_read_db
+from app.api.etag import etag_matches
+from app.api.fields import parse_fields, sparse_response
+from app.core import ics
+from app.core.cache import cache_get, cache_hget, cache_hset
+from app.core.config import settings
+from app.core.database import get_db, get_read_session_factory
 from app.models.community import Community
-from app.models.post import Post, PostPublication
+from app.models.post import Post, PostPublication, PostReadModel
 from app.models.user import User
-from app.schemas.calendar import CalendarCommunity, CalendarPost, CalendarResponse
+from app.services.post_events import calendar_density_cache_key, calendar_density_generation_key
+from app.schemas.calendar import (
+    CalendarCommunity,
+    CalendarDay,
+    CalendarDensityDay,
+    CalendarDensityResponse,
+    CalendarFeedResponse,
+    CalendarPost,
+    CalendarResponse,
+)
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
@@ -28,92 +47,517 @@ def require_extended_tier(current_user: User = Depends(get_current_user)) -> Use
     return current_user
 
 
+def user_timezone(user: User) -> ZoneInfo:
+    """Resolve the user's IANA timezone, falling back to UTC for unknown names."""
+    try:
+        return ZoneInfo(user.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def month_range(year: int, month: int, tz: ZoneInfo) -> tuple[datetime, datetime]:
+    """Start (inclusive) and end (exclusive) of a month in the given timezone, as UTC."""
+    start = datetime(year, month, 1, tzinfo=tz)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=tz)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+CALENDAR_POST_COLUMNS = (Post.id, Post.content_text, Post.scheduled_at, Post.status, Post.updated_at)
+
+CALENDAR_FIELDS = {
+    "content_text": Post.content_text,
+    "content_preview": Post.content_preview,
+    "status": Post.status,
+}
+CALENDAR_SPARSE_FIELDS = ["id", *CALENDAR_FIELDS, "scheduled_at", "local_date", "communities"]
+
+
+def calendar_rows_query(
+    user_id: UUID,
+    range_start: datetime,
+    range_end: datetime | None,
+    community_id: UUID | None = None,
+    post_columns: Sequence = CALENDAR_POST_COLUMNS,
+    with_communities: bool = True,
+) -> Select:
+    """
+    Select scheduled posts in [range_start, range_end) with their communities.
+
+    range_end may be None for an open-ended range.
+
+    One row per (post, community) pair, ordered by scheduled_at and post id so rows of
+    the same post are adjacent; posts without publications yield a single row with
+    NULL community columns. Without communities it is one row per post.
+    """
+    if with_communities:
+        query = (
+            select(
+                *post_columns,
+                Community.id.label("community_id"),
+                Community.name.label("community_name"),
+                Community.platform,
+            )
+            .outerjoin(PostPublication, PostPublication.post_id == Post.id)
+            .outerjoin(Community, Community.id == PostPublication.community_id)
+            .order_by(Post.scheduled_at, Post.id, Community.name)
+        )
+    else:
+        query = select(*post_columns).order_by(Post.scheduled_at, Post.id)
+
+    query = query.where(
+        Post.user_id == user_id,
+        Post.scheduled_at.isnot(None),
+        Post.scheduled_at >= range_start,
+    )
+
+    if range_end is not None:
+        query = query.where(Post.scheduled_at < range_end)
+
+    if community_id:
+        # Keep all communities of matching posts, not only the filtered one
+        query = query.where(
+            Post.id.in_(select(PostPublication.post_id).where(PostPublication.community_id == community_id))
+        )
+
+    return query
+
+
+def _local_date(scheduled_at: datetime, tz: ZoneInfo) -> date:
+    """Calendar day of a scheduled time in the user's timezone."""
+    if scheduled_at.tzinfo is None:
+        scheduled_at = scheduled_at.replace(tzinfo=timezone.utc)
+    return scheduled_at.astimezone(tz).date()
+
+
+async def _sparse_calendar(
+    db: AsyncSession,
+    user_id: UUID,
+    month_start: datetime,
+    month_end: datetime,
+    community_id: UUID | None,
+    selected_fields: list[str],
+    tz: ZoneInfo,
+    month: int,
+    year: int,
+) -> JSONResponse:
+    """Calendar with only the requested post fields selected and returned."""
+    with_communities = "communities" in selected_fields
+    post_columns = [
+        Post.id,
+        Post.scheduled_at,
+        *[CALENDAR_FIELDS[name] for name in selected_fields if name in CALENDAR_FIELDS],
+    ]
+    result = await db.execute(
+        calendar_rows_query(user_id, month_start, month_end, community_id, post_columns, with_communities)
+    )
+
+    posts: list[dict] = []
+    days: dict = {}
+    for row in result:
+        if not posts or posts[-1]["id"] != row.id:
+            local_date = _local_date(row.scheduled_at, tz)
+            values = {"local_date": local_date, "communities": [], **row._mapping}
+            posts.append({name: values[name] for name in selected_fields})
+            days.setdefault(local_date, []).append(row.id)
+
+        if with_communities and row.community_id is not None:
+            posts[-1]["communities"].append(
+                {"id": row.community_id, "name": row.community_name, "platform": row.platform}
+            )
+
+    return sparse_response(
+        {
+            "month": month,
+            "year": year,
+            "timezone": tz.key,
+            "posts": posts,
+            "days": [{"date": day, "post_ids": post_ids} for day, post_ids in days.items()],
+        }
+    )
+
+
+async def calendar_month(
+    db: AsyncSession,
+    user_id: UUID,
+    tz: ZoneInfo,
+    year: int,
+    month: int,
+    community_id: UUID | None = None,
+) -> CalendarResponse:
+    """Full calendar of a month, built from the posts' stored documents (post read model)."""
+    month_start, month_end = month_range(year, month, tz)
+
+    # Single read of the posts' stored documents
+    query = (
+        select(PostReadModel.document)
+        .where(
+            PostReadModel.user_id == user_id,
+            PostReadModel.scheduled_at.isnot(None),
+            PostReadModel.scheduled_at >= month_start,
+            PostReadModel.scheduled_at < month_end,
+        )
+        .order_by(PostReadModel.scheduled_at, PostReadModel.post_id)
+    )
+    if community_id:
+        query = query.where(
+            PostReadModel.post_id.in_(
+                select(PostPublication.post_id).where(PostPublication.community_id == community_id)
+            )
+        )
+    result = await db.execute(query)
+
+    # Build calendar posts with communities
+    calendar_posts: list[CalendarPost] = []
+    days: dict = {}
+    for document in result.scalars():
+        scheduled_at = datetime.fromisoformat(document["scheduled_at"])
+        local_date = _local_date(scheduled_at, tz)
+        calendar_posts.append(
+            CalendarPost(
+                id=document["id"],
+                content_text=document["content_text"],
+                scheduled_at=scheduled_at,
+                local_date=local_date,
+                status=document["status"],
+                communities=[
+                    CalendarCommunity(
+                        id=publication["community_id"],
+                        name=publication["community_name"],
+                        platform=publication["platform"],
+                    )
+                    for publication in document["publications"]
+                ],
+            )
+        )
+        days.setdefault(local_date, []).append(calendar_posts[-1].id)
+
+    return CalendarResponse(
+        month=month,
+        year=year,
+        timezone=tz.key,
+        posts=calendar_posts,
+        days=[CalendarDay(date=day, post_ids=post_ids) for day, post_ids in days.items()],
+    )
+
+
 @router.get("", response_model=CalendarResponse)
 async def get_calendar(
     month: int | None = Query(None, ge=1, le=12, description="Month number (1-12)"),
     year: int | None = Query(None, ge=2000, description="Year"),
     community_id: UUID | None = Query(None, description="Filter by community"),
+    fields: str | None = Query(None, description="Comma separated post fields, e.g. id,content_preview"),
     current_user: User = Depends(require_extended_tier),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get calendar view of scheduled posts."""
+    """
+    Get calendar view of scheduled posts (month and days in the user's timezone).
+
+    With `fields`, only the requested post columns are selected and returned.
+    """
+    selected_fields = parse_fields(fields, CALENDAR_SPARSE_FIELDS)
+    tz = user_timezone(current_user)
+
     # Set default to current month/year
-    now = datetime.now(timezone.utc)
+    now = datetime.now(tz)
     if year is None:
         year = now.year
     if month is None:
         month = now.month
 
     # Calculate date range for the month
-    _, last_day = monthrange(year, month)
-    month_start = datetime(year, month, 1, tzinfo=timezone.utc)
-    month_end = datetime(year, month, last_day, 23, 59, 59, tzinfo=timezone.utc)
-
-    # Build query for posts scheduled in this month
-    query = select(Post).where(
-        Post.user_id == current_user.id,
-        Post.scheduled_at.isnot(None),
-        Post.scheduled_at >= month_start,
-        Post.scheduled_at <= month_end,
-    )
+    month_start, month_end = month_range(year, month, tz)
 
     # Filter by community if provided
     if community_id:
         # Verify community belongs to user
         community_result = await db.execute(
-            select(Community).where(
+            select(Community.id).where(
                 Community.id == community_id,
                 Community.user_id == current_user.id,
                 Community.deleted_at.is_(None),
             )
         )
-        community = community_result.scalar_one_or_none()
-        if not community:
+        if community_result.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Community not found",
             )
 
-        # Filter posts by community through publications
-        query = query.join(PostPublication).where(PostPublication.community_id == community_id)
+    if selected_fields is not None:
+        return await _sparse_calendar(
+            db, current_user.id, month_start, month_end, community_id, selected_fields, tz, month, year
+        )
 
-    # Execute query
-    result = await db.execute(query.order_by(Post.scheduled_at))
-    posts = result.scalars().all()
+    return await calendar_month(db, current_user.id, tz, year, month, community_id)
 
-    # Build calendar posts with communities
-    calendar_posts = []
-    for post in posts:
-        # Get communities for this post
-        pub_result = await db.execute(
-            select(PostPublication, Community)
-            .join(Community, PostPublication.community_id == Community.id)
-            .where(PostPublication.post_id == post.id)
-        )
-        publications_data = pub_result.all()
-
-        communities = []
-        for pub, community in publications_data:
-            communities.append(
-                CalendarCommunity(
-                    id=community.id,
-                    name=community.name,
-                    platform=community.platform,
+
+@router.get("/density", response_model=CalendarDensityResponse)
+async def get_calendar_density(
+    year: int | None = Query(None, ge=2000, description="Year"),
+    quarter: int | None = Query(None, ge=1, le=4, description="Quarter (1-4), whole year if omitted"),
+    by_community: bool = Query(False, description="Also count posts per community"),
+    current_user: User = Depends(require_extended_tier),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get post counts per day and status for a year or quarter heatmap.
+
+    Counts come from one GROUP BY over posts (joined with publications only when
+    by_community is set) and are cached per user until the user's posts change.
+    Misses are computed on the primary, so a lagging replica never refills the
+    cache with counts from before a change. Cache fields include the user's
+    invalidation generation, read before the query: a result computed while a
+    change committed is stored under the old generation and never served.
+    """
+    tz = user_timezone(current_user)
+    if year is None:
+        year = datetime.now(tz).year
+
+    cache_key = calendar_density_cache_key(current_user.id)
+    generation = int(await cache_get(calendar_density_generation_key(current_user.id)) or 0)
+    cache_field = f"{generation}:{year}:{quarter or 0}:{int(by_community)}:{tz.key}"
+    cached = await cache_hget(cache_key, cache_field)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    if quarter:
+        first_month, months = (quarter - 1) * 3 + 1, 3
+    else:
+        first_month, months = 1, 12
+    range_start, _ = month_range(year, first_month, tz)
+    _, range_end = month_range(year, first_month + months - 1, tz)
+
+    # Rendered inline so the grouped expression is textually identical in SELECT and GROUP BY
+    tz_name = literal(tz.key, String, literal_execute=True)
+    local_day = cast(func.timezone(tz_name, Post.scheduled_at), Date).label("day")
+    query = select(
+        local_day,
+        Post.status,
+        func.count(func.distinct(Post.id)).label("posts"),
+    ).where(
+        Post.user_id == current_user.id,
+        Post.scheduled_at >= range_start,
+        Post.scheduled_at < range_end,
+    )
+    if by_community:
+        # One pass for both breakdowns: (day, status) rows have a community_id of NULL,
+        # (day, community) rows have a status of NULL (posts.status is never NULL)
+        query = (
+            query.add_columns(PostPublication.community_id)
+            .outerjoin(PostPublication, PostPublication.post_id == Post.id)
+            .group_by(
+                func.grouping_sets(
+                    tuple_(local_day, Post.status),
+                    tuple_(local_day, PostPublication.community_id),
                 )
             )
+        )
+    else:
+        query = query.group_by(local_day, Post.status)
+    result = await db.execute(query.order_by(local_day))
 
-        calendar_posts.append(
-            CalendarPost(
-                id=post.id,
-                content_text=post.content_text,
-                scheduled_at=post.scheduled_at,
-                status=post.status,
-                communities=communities,
-            )
+    days: dict = {}
+    for row in result:
+        day = days.setdefault(
+            row.day,
+            {"total": 0, "by_status": {}, "by_community": {} if by_community else None},
         )
+        if row.status is not None:
+            day["by_status"][row.status] = row.posts
+            day["total"] += row.posts
+        elif row.community_id is not None:
+            day["by_community"][row.community_id] = row.posts
 
-    return CalendarResponse(
-        month=month,
+    response = CalendarDensityResponse(
         year=year,
-        posts=calendar_posts,
+        quarter=quarter,
+        timezone=tz.key,
+        days=[CalendarDensityDay(date=day, **counts) for day, counts in days.items()],
+    )
+    payload = response.model_dump_json()
+    await cache_hset(cache_key, cache_field, payload, settings.calendar_density_cache_ttl_seconds)
+    return Response(content=payload, media_type="application/json")
+
+
+def _feed_url(token: str) -> str:
+    """Public URL of a calendar feed."""
+    return f"{settings.api_public_url}/api/v1/calendar/feed/{token}.ics"
+
+
+@router.post("/feed-token", response_model=CalendarFeedResponse)
+async def create_feed_token(
+    current_user: User = Depends(require_extended_tier),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create (or regenerate, revoking the old one) the ICS feed link."""
+    current_user.calendar_feed_token = secrets.token_urlsafe(32)
+    await db.commit()
+
+    return CalendarFeedResponse(url=_feed_url(current_user.calendar_feed_token))
+
+
+@router.delete("/feed-token")
+async def revoke_feed_token(
+    current_user: User = Depends(require_extended_tier),
+    db: AsyncSession = Depends(get_db),
+):
+    """Revoke the ICS feed link."""
+    current_user.calendar_feed_token = None
+    await db.commit()
+
+    return {"message": "Calendar feed revoked"}
+
+
+# Shown duration of a post in calendar clients
+FEED_EVENT_DURATION = timedelta(minutes=30)
+
+FEED_EVENT_STATUS = {
+    "scheduled": "TENTATIVE",
+    "publishing": "TENTATIVE",
+    "published": "CONFIRMED",
+    "partially_published": "CONFIRMED",
+    "failed": "CANCELLED",
+}
+
+
+def _feed_window_start() -> datetime:
+    """Start of the feed window, quantized to a day so the feed is stable within a day."""
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=settings.calendar_feed_past_days)
+
+
+def _render_feed_event(post, communities: list[str]) -> str:
+    """Render one post as a VEVENT."""
+    first_line = post.content_text.strip().splitlines()[0] if post.content_text.strip() else ""
+    summary = first_line[:80] + ("…" if len(first_line) > 80 else "")
+    if post.status == "failed":
+        summary = f"[Ошибка] {summary}"
+    description = post.content_text
+    if communities:
+        description += "\n\n" + ", ".join(communities)
+
+    return ics.event(
+        uid=f"{post.id}@publicboost",
+        start=post.scheduled_at,
+        end=post.scheduled_at + FEED_EVENT_DURATION,
+        stamp=post.updated_at,
+        summary=summary,
+        description=description,
+        status=FEED_EVENT_STATUS.get(post.status),
+        categories=communities,
+    )
+
+
+async def _stream_feed(user_id: UUID, tz_name: str, window_start: datetime) -> AsyncIterator[str]:
+    """Stream the ICS document row by row from a server-side cursor."""
+    yield ics.calendar_header("Public Boost", tz_name)
+
+    session_factory = await get_read_session_factory(user_id)
+    async with session_factory() as session:
+        result = await session.stream(
+            calendar_rows_query(user_id, window_start, None).execution_options(yield_per=200)
+        )
+        current_post = None
+        communities: list[str] = []
+        async for row in result:
+            if current_post is not None and row.id != current_post.id:
+                yield _render_feed_event(current_post, communities)
+                communities = []
+            current_post = row
+            if row.community_name is not None:
+                communities.append(f"{row.community_name} ({row.platform})")
+        if current_post is not None:
+            yield _render_feed_event(current_post, communities)
+
+    yield ics.calendar_footer()
+
+
+@router.get("/feed/{token}.ics", response_class=Response)
+async def get_calendar_feed(
+    token: str,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+):
+    """
+    ICS feed of scheduled posts for calendar clients (authenticated by the link token).
+
+    A single aggregate query resolves the token and computes the feed version
+    (latest updated_at of posts, publications and communities, plus post and
+    publication counts: removing a publication changes no updated_at).
+    Unchanged feeds are answered with 304 without reading any posts.
+    """
+    window_start = _feed_window_start()
+
+    session_factory = await get_read_session_factory(None)
+    async with session_factory() as db:
+        state_result = await db.execute(
+            select(
+                User.id,
+                User.timezone,
+                User.subscription_tier,
+                func.count(func.distinct(Post.id)).label("post_count"),
+                func.count(PostPublication.id).label("publication_count"),
+                func.max(Post.updated_at).label("posts_updated_at"),
+                func.max(PostPublication.updated_at).label("publications_updated_at"),
+                func.max(Community.updated_at).label("communities_updated_at"),
+            )
+            .outerjoin(
+                Post,
+                and_(Post.user_id == User.id, Post.scheduled_at >= window_start),
+            )
+            .outerjoin(PostPublication, PostPublication.post_id == Post.id)
+            .outerjoin(Community, Community.id == PostPublication.community_id)
+            .where(User.calendar_feed_token == token, User.is_active == True)
+            .group_by(User.id)
+        )
+        state = state_result.one_or_none()
+
+    if state is None or state.subscription_tier != "extended":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar feed not found",
+        )
+
+    timestamps = [
+        ts
+        for ts in (state.posts_updated_at, state.publications_updated_at, state.communities_updated_at)
+        if ts is not None
+    ]
+    last_modified = max(timestamps) if timestamps else window_start
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    version = "|".join(
+        [
+            str(state.id),
+            window_start.isoformat(),
+            str(state.post_count),
+            str(state.publication_count),
+            state.timezone,
+        ]
+        + [ts.isoformat() if ts else "" for ts in timestamps]
+    )
+    etag = f'"{sha256(version.encode()).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": "private, max-age=300",
+    }
+
+    if if_none_match is not None:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    elif if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            since = None
+        if since is not None and last_modified.replace(microsecond=0) <= since:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    tz_name = state.timezone if state.timezone else "UTC"
+    return StreamingResponse(
+        _stream_feed(state.id, tz_name, window_start),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
     )
@@ -3,15 +3,18 @@
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import get_current_user, get_read_db
+from app.api.etag import etag_headers, etag_matches, not_modified, weak_etag
+from app.api.fields import parse_fields, sparse_response
 from app.core.database import get_db
 from app.core.security import encrypt_token
 from app.models.community import Community
 from app.models.user import User
+from app.services.post_read_model import refresh_post_documents
 from app.schemas.community import (
     CommunityCreate,
     CommunityListResponse,
@@ -21,19 +24,63 @@ from app.schemas.community import (
 
 router = APIRouter(prefix="/communities", tags=["communities"])
 
+COMMUNITY_FIELDS = {
+    "platform": Community.platform,
+    "external_id": Community.external_id,
+    "name": Community.name,
+    "is_active": Community.is_active,
+    "token_expires_at": Community.token_expires_at,
+    "last_sync_at": Community.last_sync_at,
+    "created_at": Community.created_at,
+    "updated_at": Community.updated_at,
+}
+COMMUNITY_SPARSE_FIELDS = ["id", *COMMUNITY_FIELDS]
+
+
+def communities_etag(
+    user_id: UUID,
+    total: int,
+    last_updated_at: datetime | None,
+    platform: str | None = None,
+    is_active: bool | None = None,
+    page: int = 1,
+    page_size: int = 20,
+    fields: str | None = None,
+) -> str:
+    """Weak ETag of a community list page: version of the filtered set plus the request parameters."""
+    return weak_etag(user_id, total, last_updated_at, platform, is_active, page, page_size, fields)
+
 
 @router.get("", response_model=CommunityListResponse)
 async def get_communities(
+    response: Response,
     platform: str | None = Query(None, description="Filter by platform (vk, telegram)"),
     is_active: bool | None = Query(None, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    fields: str | None = Query(None, description="Comma separated fields, e.g. id,name,platform"),
+    if_none_match: str | None = Header(None),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get list of user's communities."""
+    """
+    Get list of user's communities.
+
+    With `fields`, only the requested columns are selected and returned.
+    The weak ETag covers count and max(updated_at) of the filtered set, so a
+    matching If-None-Match is answered with 304 after that one aggregate query.
+    """
+    selected_fields = parse_fields(fields, COMMUNITY_SPARSE_FIELDS)
+
     # Build query
-    query = select(Community).where(
+    if selected_fields is None:
+        query = select(Community)
+    else:
+        query = select(
+            Community.id,
+            *[COMMUNITY_FIELDS[name] for name in selected_fields if name in COMMUNITY_FIELDS],
+        )
+    query = query.where(
         Community.user_id == current_user.id,
         Community.deleted_at.is_(None),  # Only active (not soft-deleted)
     )
@@ -50,10 +97,17 @@ async def get_communities(
     if is_active is not None:
         query = query.where(Community.is_active == is_active)
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
+    # Get total count and the version of the filtered set
+    version_result = await db.execute(
+        query.with_only_columns(func.count(), func.max(Community.updated_at))
+    )
+    total, last_updated_at = version_result.one()
+
+    etag = communities_etag(current_user.id, total, last_updated_at, platform, is_active, page, page_size, fields)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    headers = etag_headers(etag)
+    response.headers.update(headers)
 
     # Apply pagination
     offset = (page - 1) * page_size
@@ -61,19 +115,25 @@ async def get_communities(
 
     # Execute query
     result = await db.execute(query)
-    communities = result.scalars().all()
 
     # Calculate pagination
     total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    pagination = {
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": total_pages,
+    }
+
+    if selected_fields is not None:
+        return sparse_response(
+            {"data": [row._asdict() for row in result], "pagination": pagination}, headers
+        )
 
+    communities = result.scalars().all()
     return CommunityListResponse(
         data=[CommunityResponse.model_validate(c) for c in communities],
-        pagination={
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": total_pages,
-        },
+        pagination=pagination,
     )
 
 
@@ -81,7 +141,7 @@ async def get_communities(
 async def get_community(
     community_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get community details."""
     result = await db.execute(
@@ -214,8 +274,10 @@ async def update_community(
         )
 
     # Update fields
-    if request.name is not None:
+    if request.name is not None and request.name != community.name:
         community.name = request.name
+        # Publication entries of post documents carry the community name
+        await refresh_post_documents(db, community_id=community.id)
 
     await db.commit()
     await db.refresh(community)
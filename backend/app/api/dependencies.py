@@ -1,12 +1,14 @@
 """API dependencies."""
 
+import secrets
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_analytics_db, get_db, get_read_session_factory
 from app.core.security import decode_access_token
 from app.models.user import User
 
@@ -47,9 +49,51 @@ async def get_current_user(
             detail="User not found or inactive",
         )
 
+    # Lets the session pin this user's reads to the primary after a write
+    db.info["user_id"] = user.id
+
     return user
 
 
+async def get_current_analytics_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_analytics_db),
+) -> User:
+    """Get current user through the analytics pool session.
+
+    Analytics endpoints authenticate on the same session they query with, so a slow
+    dashboard request never holds a connection from the interactive pool.
+    """
+    return await get_current_user(credentials=credentials, db=db)
+
+
+async def get_read_db(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncSession:
+    """Get a read-only session, served by the replica when it is fresh enough.
+
+    Falls back to the primary when no replica is configured, replication lag exceeds
+    replica_max_lag_seconds, or the user wrote within the read-your-writes window.
+    """
+    # Authentication is done; return its primary connection to the pool
+    await db.commit()
+    session_factory = await get_read_session_factory(current_user.id)
+    async with session_factory() as session:
+        yield session
+
+
+async def get_analytics_read_db(
+    current_user: User = Depends(get_current_analytics_user),
+    db: AsyncSession = Depends(get_analytics_db),
+) -> AsyncSession:
+    """Get a read-only analytics session, served by the replica when it is fresh enough."""
+    await db.commit()
+    session_factory = await get_read_session_factory(current_user.id, workload="analytics")
+    async with session_factory() as session:
+        yield session
+
+
 async def get_optional_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
     db: AsyncSession = Depends(get_db),
@@ -63,3 +107,22 @@ async def get_optional_user(
     except HTTPException:
         return None
 
+
+
+internal_security = HTTPBearer(auto_error=False)
+
+
+async def require_internal_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(internal_security),
+) -> None:
+    """Allow internal endpoints only with the configured metrics token; hide them when none is set."""
+    if not settings.internal_metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.internal_metrics_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,38 @@
+"""Conditional GET support: weak ETags computed from cheap version queries."""
+
+from datetime import datetime
+from hashlib import sha256
+
+from fastapi import Response, status
+
+# Polling clients must revalidate every time, which costs a 304 when nothing changed
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    """Weak entity tag over the version parts of a representation."""
+    version = "|".join(
+        "" if part is None else part.isoformat() if isinstance(part, datetime) else str(part)
+        for part in parts
+    )
+    return f'W/"{sha256(version.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evaluate If-None-Match with the weak comparison function (RFC 9110, 13.1.2)."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """Validator headers sent with both 200 and 304 responses."""
+    return {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matching validator."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
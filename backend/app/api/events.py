@@ -0,0 +1,49 @@
+"""Live events endpoint (Server-Sent Events)."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.events import event_hub
+from app.models.user import User
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+async def _event_stream(user_id: UUID) -> AsyncIterator[str]:
+    """SSE frames of the user's events, with comment keep-alives while idle."""
+    async with event_hub.subscribe(user_id) as queue:
+        yield f"retry: {settings.events_retry_ms}\nevent: ready\ndata: {{}}\n\n"
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=settings.events_keepalive_seconds)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+
+
+@router.get("")
+async def stream_events(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Stream the user's post and publication status changes as Server-Sent Events.
+
+    Events: `ready` (subscribed; fetch current state now), `post.status`,
+    `publication.status` and `resync` (events may have been lost; refetch).
+    The connection holds no database session.
+    """
+    # Authentication is done; return its connection to the pool for the stream's lifetime
+    await db.close()
+    return StreamingResponse(
+        _event_stream(current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
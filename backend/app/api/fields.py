@@ -0,0 +1,32 @@
+"""Sparse fieldsets (`fields=` query parameter) for list endpoints."""
+
+from collections.abc import Collection
+
+from fastapi import HTTPException, status
+
+from app.core.serialization import ORJSONResponse
+
+
+def parse_fields(fields: str | None, allowed: Collection[str]) -> list[str] | None:
+    """
+    Parse a comma separated field list.
+
+    Returns None when the parameter is absent (full representation). `id` is always
+    included; unknown names are rejected with 400.
+    """
+    if fields is None:
+        return None
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def sparse_response(content: dict, headers: dict[str, str] | None = None) -> ORJSONResponse:
+    """Return a partial representation as is, bypassing the full response model."""
+    return ORJSONResponse(content=content, headers=headers)
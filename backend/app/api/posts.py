@@ -1,18 +1,49 @@
 """Posts endpoints."""
 
+import base64
+import binascii
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import ColumnElement, Float, Select, cast, delete, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user
-from app.core.database import get_db
+from app.api.dependencies import get_current_user, get_read_db
+from app.api.etag import etag_headers, etag_matches, not_modified, weak_etag
+from app.api.fields import parse_fields, sparse_response
+from app.core.config import settings
+from app.core.database import get_db, get_read_session_factory
+from app.core.serialization import document_list_response, document_response, model_response
 from app.models.community import Community
-from app.models.post import Post, PostPublication
+from app.models.post import Post, PostPublication, PostReadModel
+from app.models.task import ScheduledTask
 from app.models.user import User
-from app.schemas.post import PostCreate, PostListResponse, PostResponse, PostUpdate
+from app.schemas.post import (
+    PostBatchCreate,
+    PostBatchItemResult,
+    PostBatchResponse,
+    PostBulkOperation,
+    PostBulkResult,
+    PostCreate,
+    PostListResponse,
+    PostPublicationResponse,
+    PostResponse,
+    PostSearchResponse,
+    PostSearchResult,
+    PostStatusSummary,
+    PostUpdate,
+)
+from app.services.post_counters import adjust_post_counters, get_post_counters
+from app.services.post_events import posts_changed
+from app.services.post_read_model import document_json, refresh_post_documents
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
@@ -27,25 +58,89 @@ def require_extended_tier(current_user: User = Depends(get_current_user)) -> Use
     return current_user
 
 
-def validate_scheduled_at(scheduled_at: datetime | None) -> None:
-    """Validate scheduled_at is in future and not more than 30 days ahead."""
+def scheduled_at_error(scheduled_at: datetime | None) -> str | None:
+    """Return why scheduled_at is invalid (must be in future, at most 30 days ahead), or None."""
     if scheduled_at is None:
-        return
+        return None
 
     now = datetime.now(timezone.utc)
     max_future = now + timedelta(days=30)
 
     if scheduled_at <= now:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="scheduled_at must be in the future",
-        )
+        return "scheduled_at must be in the future"
 
     if scheduled_at > max_future:
+        return "scheduled_at cannot be more than 30 days in the future"
+
+    return None
+
+
+def validate_scheduled_at(scheduled_at: datetime | None) -> None:
+    """Validate scheduled_at is in future and not more than 30 days ahead."""
+    error = scheduled_at_error(scheduled_at)
+    if error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="scheduled_at cannot be more than 30 days in the future",
+            detail=error,
+        )
+
+
+VALID_POST_STATUSES = ["draft", "scheduled", "publishing", "published", "failed", "partially_published"]
+
+
+POST_FIELDS = {
+    "content_text": Post.content_text,
+    "content_preview": Post.content_preview,
+    "image_url": Post.image_url,
+    "scheduled_at": Post.scheduled_at,
+    "status": Post.status,
+    "error_message": Post.error_message,
+    "created_at": Post.created_at,
+    "updated_at": Post.updated_at,
+}
+POST_SPARSE_FIELDS = ["id", *POST_FIELDS, "publications"]
+
+
+async def _publications_by_post(db: AsyncSession, post_ids: list[UUID]) -> dict[UUID, list[dict]]:
+    """Publications with community names for a page of posts, in one query."""
+    result = await db.execute(
+        select(
+            PostPublication.post_id,
+            PostPublication.id,
+            PostPublication.community_id,
+            Community.name.label("community_name"),
+            Community.platform,
+            PostPublication.status,
+            PostPublication.external_post_id,
+            PostPublication.published_at,
+            PostPublication.error_message,
         )
+        .join(Community, PostPublication.community_id == Community.id)
+        .where(PostPublication.post_id.in_(post_ids))
+    )
+    publications: dict[UUID, list[dict]] = {post_id: [] for post_id in post_ids}
+    for row in result:
+        publication = row._asdict()
+        publications[publication.pop("post_id")].append(publication)
+    return publications
+
+
+def _post_response(post: Post, publications: list[dict]) -> PostResponse:
+    """Build a PostResponse from trusted database rows, without validation."""
+    return PostResponse.model_construct(
+        id=post.id,
+        content_text=post.content_text,
+        content_preview=post.content_preview,
+        image_url=post.image_url,
+        scheduled_at=post.scheduled_at,
+        status=post.status,
+        error_message=post.error_message,
+        created_at=post.created_at,
+        updated_at=post.updated_at,
+        publications=[
+            PostPublicationResponse.model_construct(**publication) for publication in publications
+        ],
+    )
 
 
 @router.get("", response_model=PostListResponse)
@@ -56,32 +151,50 @@ async def get_posts(
     scheduled_to: datetime | None = Query(None, description="Filter posts scheduled to date"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    fields: str | None = Query(None, description="Comma separated fields, e.g. id,content_preview"),
     current_user: User = Depends(require_extended_tier),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get list of user's posts."""
+    """
+    Get list of user's posts.
+
+    The full representation is served from the post read model (one stored document
+    per post). With `fields`, only the requested columns are selected and returned.
+    """
+    selected_fields = parse_fields(fields, POST_SPARSE_FIELDS)
+
     # Build query
-    query = select(Post).where(Post.user_id == current_user.id)
+    if selected_fields is None:
+        source, source_id = PostReadModel, PostReadModel.post_id
+        query = select(document_json())
+    else:
+        source, source_id = Post, Post.id
+        query = select(
+            Post.id,
+            *[POST_FIELDS[name] for name in selected_fields if name in POST_FIELDS],
+        )
+    query = query.where(source.user_id == current_user.id)
 
     # Apply filters
     if status_filter:
-        valid_statuses = ["draft", "scheduled", "publishing", "published", "failed", "partially_published"]
-        if status_filter not in valid_statuses:
+        if status_filter not in VALID_POST_STATUSES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Status must be one of: {', '.join(valid_statuses)}",
+                detail=f"Status must be one of: {', '.join(VALID_POST_STATUSES)}",
             )
-        query = query.where(Post.status == status_filter)
+        query = query.where(source.status == status_filter)
 
     if community_id:
         # Filter by community through publications
-        query = query.join(PostPublication).where(PostPublication.community_id == community_id)
+        query = query.where(
+            source_id.in_(select(PostPublication.post_id).where(PostPublication.community_id == community_id))
+        )
 
     if scheduled_from:
-        query = query.where(Post.scheduled_at >= scheduled_from)
+        query = query.where(source.scheduled_at >= scheduled_from)
 
     if scheduled_to:
-        query = query.where(Post.scheduled_at <= scheduled_to)
+        query = query.where(source.scheduled_at <= scheduled_to)
 
     # Get total count
     count_query = select(func.count()).select_from(query.subquery())
@@ -90,123 +203,375 @@ async def get_posts(
 
     # Apply pagination
     offset = (page - 1) * page_size
-    query = query.order_by(Post.created_at.desc()).offset(offset).limit(page_size)
+    query = query.order_by(source.created_at.desc()).offset(offset).limit(page_size)
+
+    # Calculate pagination
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    pagination = {
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "total_pages": total_pages,
+    }
+
+    if selected_fields is not None:
+        result = await db.execute(query)
+        items = [row._asdict() for row in result]
+        if "publications" in selected_fields and items:
+            publications = await _publications_by_post(db, [item["id"] for item in items])
+            for item in items:
+                item["publications"] = publications[item["id"]]
+        return sparse_response({"data": items, "pagination": pagination})
 
     # Execute query
     result = await db.execute(query)
-    posts = result.scalars().all()
+    return document_list_response(result.scalars().all(), pagination)
+
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+EXPORT_CSV_COLUMNS = [
+    "post_id",
+    "content_text",
+    "image_url",
+    "scheduled_at",
+    "post_status",
+    "post_error_message",
+    "created_at",
+    "updated_at",
+    "publication_id",
+    "community_id",
+    "community_name",
+    "platform",
+    "publication_status",
+    "external_post_id",
+    "published_at",
+    "publication_error_message",
+]
+
+
+def _export_query(
+    user_id: UUID,
+    status_filter: str | None,
+    community_id: UUID | None,
+    scheduled_from: datetime | None,
+    scheduled_to: datetime | None,
+) -> Select:
+    """Posts joined with their publications and community names, one row per publication."""
+    query = (
+        select(
+            Post.id.label("post_id"),
+            Post.content_text,
+            Post.image_url,
+            Post.scheduled_at,
+            Post.status.label("post_status"),
+            Post.error_message.label("post_error_message"),
+            Post.created_at,
+            Post.updated_at,
+            PostPublication.id.label("publication_id"),
+            PostPublication.community_id,
+            Community.name.label("community_name"),
+            Community.platform,
+            PostPublication.status.label("publication_status"),
+            PostPublication.external_post_id,
+            PostPublication.published_at,
+            PostPublication.error_message.label("publication_error_message"),
+        )
+        .outerjoin(PostPublication, PostPublication.post_id == Post.id)
+        .outerjoin(Community, Community.id == PostPublication.community_id)
+        .where(Post.user_id == user_id)
+    )
 
-    # Load publications for each post
-    for post in posts:
-        await db.execute(
-            select(PostPublication)
-            .where(PostPublication.post_id == post.id)
-            .options()
+    if status_filter:
+        query = query.where(Post.status == status_filter)
+    if community_id:
+        # Keep every publication of the matching posts, not only the filtered one
+        query = query.where(
+            Post.id.in_(select(PostPublication.post_id).where(PostPublication.community_id == community_id))
         )
+    if scheduled_from:
+        query = query.where(Post.scheduled_at >= scheduled_from)
+    if scheduled_to:
+        query = query.where(Post.scheduled_at <= scheduled_to)
 
-    # Calculate pagination
-    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    # Rows of one post are adjacent, so NDJSON can group them without buffering
+    return query.order_by(Post.created_at.desc(), Post.id, Community.name)
+
+
+def _export_value(value):
+    """Plain JSON/CSV representation of a column value."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _ndjson_post(rows: list) -> str:
+    """One NDJSON line for a post and its publications."""
+    first = rows[0]
+    document = {
+        "id": str(first.post_id),
+        "content_text": first.content_text,
+        "image_url": first.image_url,
+        "scheduled_at": _export_value(first.scheduled_at),
+        "status": first.post_status,
+        "error_message": first.post_error_message,
+        "created_at": _export_value(first.created_at),
+        "updated_at": _export_value(first.updated_at),
+        "publications": [
+            {
+                "id": str(row.publication_id),
+                "community_id": str(row.community_id),
+                "community_name": row.community_name,
+                "platform": row.platform,
+                "status": row.publication_status,
+                "external_post_id": row.external_post_id,
+                "published_at": _export_value(row.published_at),
+                "error_message": row.publication_error_message,
+            }
+            for row in rows
+            if row.publication_id is not None
+        ],
+    }
+    return json.dumps(document, ensure_ascii=False) + "\n"
+
+
+async def _stream_export(user_id: UUID, export_format: str, query: Select) -> AsyncIterator[str]:
+    """Stream the export from a server-side cursor, one chunk per fetched batch."""
+    batch_size = settings.posts_export_batch_size
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(EXPORT_CSV_COLUMNS)
+        yield buffer.getvalue()
+
+    session_factory = await get_read_session_factory(user_id, workload="analytics")
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        pending: list = []
+        async for partition in result.partitions(batch_size):
+            buffer.seek(0)
+            buffer.truncate()
+            if export_format == "csv":
+                writer.writerows([[_export_value(value) for value in row] for row in partition])
+            else:
+                for row in partition:
+                    if pending and row.post_id != pending[0].post_id:
+                        buffer.write(_ndjson_post(pending))
+                        pending = []
+                    pending.append(row)
+            chunk = buffer.getvalue()
+            if chunk:
+                yield chunk
+        if pending:
+            yield _ndjson_post(pending)
+
+
+@router.get("/export")
+async def export_posts(
+    export_format: str = Query("ndjson", alias="format", description="ndjson or csv"),
+    status_filter: str | None = Query(None, alias="status", description="Filter by status"),
+    community_id: UUID | None = Query(None, description="Filter by target community"),
+    scheduled_from: datetime | None = Query(None, description="Filter posts scheduled from date"),
+    scheduled_to: datetime | None = Query(None, description="Filter posts scheduled to date"),
+    current_user: User = Depends(require_extended_tier),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Export the full post history with publications and community names.
+
+    Rows are read through a server-side cursor and written to the response as they
+    arrive, so memory use does not depend on the size of the history. NDJSON emits
+    one post per line with nested publications; CSV emits one row per publication.
+    Only the cursor's connection is held while streaming.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Format must be one of: {', '.join(EXPORT_FORMATS)}",
+        )
+    if status_filter and status_filter not in VALID_POST_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Status must be one of: {', '.join(VALID_POST_STATUSES)}",
+        )
 
-    # Build response with publications
-    post_responses = []
-    for post in posts:
-        # Get publications for this post
-        pub_result = await db.execute(
-            select(PostPublication, Community)
-            .join(Community, PostPublication.community_id == Community.id)
-            .where(PostPublication.post_id == post.id)
-        )
-        publications_data = pub_result.all()
-
-        publications = []
-        for pub, community in publications_data:
-            publications.append({
-                "id": pub.id,
-                "community_id": pub.community_id,
-                "community_name": community.name,
-                "platform": community.platform,
-                "status": pub.status,
-                "external_post_id": pub.external_post_id,
-                "published_at": pub.published_at,
-                "error_message": pub.error_message,
-            })
-
-        post_dict = {
-            "id": post.id,
-            "content_text": post.content_text,
-            "image_url": post.image_url,
-            "scheduled_at": post.scheduled_at,
-            "status": post.status,
-            "error_message": post.error_message,
-            "created_at": post.created_at,
-            "updated_at": post.updated_at,
-            "publications": publications,
-        }
-        post_responses.append(PostResponse.model_validate(post_dict))
-
-    return PostListResponse(
-        data=post_responses,
-        pagination={
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "total_pages": total_pages,
-        },
+    query = _export_query(current_user.id, status_filter, community_id, scheduled_from, scheduled_to)
+    filename = f"posts-{datetime.now(timezone.utc):%Y%m%d}.{export_format}"
+    # Authentication is done; yield dependencies are torn down only after the last
+    # chunk, so return its connection to the pool for the download's lifetime
+    await db.close()
+    return StreamingResponse(
+        _stream_export(current_user.id, export_format, query),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
+SEARCH_CONFIG = "russian"
+SEARCH_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def _encode_search_cursor(rank: float, post_id: UUID) -> str:
+    """Opaque keyset cursor: rank and id of the last returned hit."""
+    return base64.urlsafe_b64encode(json.dumps([rank, str(post_id)]).encode()).decode()
+
+
+def _decode_search_cursor(cursor: str) -> tuple[float, UUID]:
+    try:
+        rank, post_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), UUID(post_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from None
+
+
+def _html_escaped(text: ColumnElement[str]) -> ColumnElement[str]:
+    """Escape &, < and > of a text column, so the only markup in a headline is <mark>."""
+    return func.replace(func.replace(func.replace(text, "&", "&amp;"), "<", "&lt;"), ">", "&gt;")
+
+
+def _like_pattern(text: str) -> str:
+    """Substring ILIKE pattern with wildcards in the user input escaped."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+@router.get("/search", response_model=PostSearchResponse)
+async def search_posts(
+    q: str = Query(..., min_length=2, max_length=200, description="Search query"),
+    status_filter: str | None = Query(None, alias="status", description="Filter by status"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(require_extended_tier),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Search post content.
+
+    Matches words through the generated `russian` tsvector (GIN index) and arbitrary
+    substrings/prefixes through the trigram index. Hits are ordered by relevance with
+    keyset pagination; snippets (HTML: escaped text with matches in <mark>) are only
+    built for the returned page.
+    """
+    if status_filter and status_filter not in VALID_POST_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Status must be one of: {', '.join(VALID_POST_STATUSES)}",
+        )
+
+    ts_query = func.websearch_to_tsquery(literal(SEARCH_CONFIG).cast(REGCONFIG), q)
+    rank = cast(
+        func.ts_rank_cd(Post.search_vector, ts_query) + func.word_similarity(q, Post.content_text),
+        Float,
+    ).label("rank")
+
+    hits = select(Post.id, rank).where(
+        Post.user_id == current_user.id,
+        or_(Post.search_vector.op("@@")(ts_query), Post.content_text.ilike(_like_pattern(q))),
+    )
+    if status_filter:
+        hits = hits.where(Post.status == status_filter)
+    if cursor:
+        after_rank, after_id = _decode_search_cursor(cursor)
+        hits = hits.where(tuple_(rank, Post.id) < tuple_(literal(after_rank, Float), after_id))
+    hits = hits.order_by(rank.desc(), Post.id.desc()).limit(limit + 1).subquery()
+
+    result = await db.execute(
+        select(
+            Post.id,
+            Post.status,
+            Post.scheduled_at,
+            Post.created_at,
+            hits.c.rank,
+            func.ts_headline(
+                literal(SEARCH_CONFIG).cast(REGCONFIG),
+                _html_escaped(Post.content_text),
+                ts_query,
+                SEARCH_HEADLINE_OPTIONS,
+            ).label("snippet"),
+        )
+        .join(hits, hits.c.id == Post.id)
+        .order_by(hits.c.rank.desc(), Post.id.desc())
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_search_cursor(rows[-1].rank, rows[-1].id)
+
+    return PostSearchResponse(
+        data=[
+            PostSearchResult(
+                id=row.id,
+                snippet=row.snippet,
+                rank=row.rank,
+                status=row.status,
+                scheduled_at=row.scheduled_at,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/summary", response_model=PostStatusSummary)
+async def get_posts_summary(
+    current_user: User = Depends(require_extended_tier),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Number of the user's posts in each status (dashboard badges).
+
+    Read from the maintained per-user counters, not by counting posts.
+    """
+    counters = await get_post_counters(db, current_user.id)
+    counts = {post_status: max(counters.get(post_status, 0), 0) for post_status in VALID_POST_STATUSES}
+    return PostStatusSummary(counts=counts, total=sum(counts.values()))
+
+
 @router.get("/{post_id}", response_model=PostResponse)
 async def get_post(
     post_id: UUID,
+    if_none_match: str | None = Header(None),
     current_user: User = Depends(require_extended_tier),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get post details."""
-    result = await db.execute(
-        select(Post).where(Post.id == post_id, Post.user_id == current_user.id)
+    """
+    Get post details.
+
+    Served from the post read model. The weak ETag is derived from the time the
+    document was last refreshed; a matching If-None-Match is answered with 304
+    without reading the document.
+    """
+    version_result = await db.execute(
+        select(PostReadModel.refreshed_at).where(
+            PostReadModel.post_id == post_id,
+            PostReadModel.user_id == current_user.id,
+        )
     )
-    post = result.scalar_one_or_none()
+    refreshed_at = version_result.scalar_one_or_none()
 
-    if not post:
+    if refreshed_at is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found",
         )
 
-    # Get publications
-    pub_result = await db.execute(
-        select(PostPublication, Community)
-        .join(Community, PostPublication.community_id == Community.id)
-        .where(PostPublication.post_id == post.id)
-    )
-    publications_data = pub_result.all()
-
-    publications = []
-    for pub, community in publications_data:
-        publications.append({
-            "id": pub.id,
-            "community_id": pub.community_id,
-            "community_name": community.name,
-            "platform": community.platform,
-            "status": pub.status,
-            "external_post_id": pub.external_post_id,
-            "published_at": pub.published_at,
-            "error_message": pub.error_message,
-        })
-
-    post_dict = {
-        "id": post.id,
-        "content_text": post.content_text,
-        "image_url": post.image_url,
-        "scheduled_at": post.scheduled_at,
-        "status": post.status,
-        "error_message": post.error_message,
-        "created_at": post.created_at,
-        "updated_at": post.updated_at,
-        "publications": publications,
-    }
+    etag = weak_etag(post_id, refreshed_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
 
-    return PostResponse.model_validate(post_dict)
+    result = await db.execute(select(document_json()).where(PostReadModel.post_id == post_id))
+    return document_response(result.scalar_one(), headers=etag_headers(etag))
 
 
 @router.post("", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
@@ -270,47 +635,386 @@ async def create_post(
             )
             db.add(publication)
 
+    await refresh_post_documents(db, [post.id])
+    await adjust_post_counters(db, current_user.id, [(None, post_status)])
     await db.commit()
     await db.refresh(post)
+    await posts_changed(current_user.id, [(post.id, post.status)])
 
     # TODO: Enqueue task in Celery if scheduled
     # For MVP, we'll skip this
 
-    # Get publications for response
-    publications = []
-    if request.community_ids:
-        pub_result = await db.execute(
-            select(PostPublication, Community)
-            .join(Community, PostPublication.community_id == Community.id)
-            .where(PostPublication.post_id == post.id)
-        )
-        publications_data = pub_result.all()
-
-        for pub, community in publications_data:
-            publications.append({
-                "id": pub.id,
-                "community_id": pub.community_id,
-                "community_name": community.name,
-                "platform": community.platform,
-                "status": pub.status,
-                "external_post_id": pub.external_post_id,
-                "published_at": pub.published_at,
-                "error_message": pub.error_message,
-            })
-
-    post_dict = {
-        "id": post.id,
-        "content_text": post.content_text,
-        "image_url": post.image_url,
-        "scheduled_at": post.scheduled_at,
-        "status": post.status,
-        "error_message": post.error_message,
-        "created_at": post.created_at,
-        "updated_at": post.updated_at,
-        "publications": publications,
-    }
+    publications = await _publications_by_post(db, [post.id])
+    return model_response(
+        PostResponse,
+        _post_response(post, publications[post.id]),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+def _parse_csv_items(body: bytes) -> list[dict]:
+    """
+    Parse a CSV content plan into PostCreate-like dicts.
+
+    Expected header: content_text, image_url, scheduled_at, community_ids
+    (only content_text is required; community_ids are separated by ';').
+    """
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV must be UTF-8 encoded",
+        ) from None
+
+    reader = csv.DictReader(io.StringIO(text))
+    items = []
+    try:
+        if not reader.fieldnames or "content_text" not in reader.fieldnames:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV header must include content_text",
+            )
+
+        for row in reader:
+            item: dict = {"content_text": row.get("content_text") or ""}
+            if row.get("image_url"):
+                item["image_url"] = row["image_url"]
+            if row.get("scheduled_at"):
+                item["scheduled_at"] = row["scheduled_at"]
+            if row.get("community_ids"):
+                item["community_ids"] = [cid.strip() for cid in row["community_ids"].split(";") if cid.strip()]
+            items.append(item)
+    except csv.Error as e:
+        # Malformed quoting, NUL bytes or a field over csv.field_size_limit()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid CSV: {e}",
+        ) from None
+    return items
+
+
+def _validation_error_message(error: ValidationError) -> str:
+    """Flatten a pydantic validation error into one line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" if err["loc"] else err["msg"]
+        for err in error.errors()
+    )
+
+
+@router.post("/batch", response_model=PostBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_posts_batch(
+    request: Request,
+    all_or_nothing: bool = Query(False, description="Create nothing if any item is invalid"),
+    current_user: User = Depends(require_extended_tier),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Create many posts at once from a JSON body ({"posts": [...]}) or a CSV file (text/csv).
+
+    All referenced communities are validated with one query, posts and publications are
+    inserted with multi-row INSERTs in a single transaction. Invalid items are reported
+    per index and skipped (or fail the whole batch with all_or_nothing).
+    """
+    body = await request.body()
+    if "csv" in request.headers.get("content-type", ""):
+        raw_items = _parse_csv_items(body)
+    else:
+        try:
+            raw_items = PostBatchCreate.model_validate_json(body).posts
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=_validation_error_message(e),
+            ) from None
+
+    if not raw_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batch is empty",
+        )
+    if len(raw_items) > settings.posts_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch cannot contain more than {settings.posts_batch_max_items} posts",
+        )
+
+    # Validate items individually
+    results: list[PostBatchItemResult | None] = [None] * len(raw_items)
+    valid_items: list[tuple[int, PostCreate]] = []
+    for index, raw_item in enumerate(raw_items):
+        try:
+            item = PostCreate.model_validate(raw_item)
+        except ValidationError as e:
+            results[index] = PostBatchItemResult(index=index, status="error", error=_validation_error_message(e))
+            continue
+
+        if item.scheduled_at is not None and item.scheduled_at.tzinfo is None:
+            item.scheduled_at = item.scheduled_at.replace(tzinfo=timezone.utc)
+        error = scheduled_at_error(item.scheduled_at)
+        if error is None and item.scheduled_at and not item.community_ids:
+            error = "community_ids is required when scheduled_at is provided"
+        if error:
+            results[index] = PostBatchItemResult(index=index, status="error", error=error)
+            continue
+
+        if item.community_ids:
+            item.community_ids = list(dict.fromkeys(item.community_ids))
+        valid_items.append((index, item))
+
+    # Validate all referenced communities with one query
+    referenced_ids = {cid for _, item in valid_items for cid in item.community_ids or []}
+    active_ids: set[UUID] = set()
+    if referenced_ids:
+        communities_result = await db.execute(
+            select(Community.id).where(
+                Community.id.in_(referenced_ids),
+                Community.user_id == current_user.id,
+                Community.deleted_at.is_(None),
+                Community.is_active == True,
+            )
+        )
+        active_ids = set(communities_result.scalars().all())
+
+    post_rows = []
+    publication_rows = []
+    for index, item in valid_items:
+        if item.community_ids and not set(item.community_ids) <= active_ids:
+            results[index] = PostBatchItemResult(
+                index=index, status="error", error="One or more communities not found or not active"
+            )
+            continue
+
+        post_id = uuid4()
+        post_rows.append({
+            "id": post_id,
+            "user_id": current_user.id,
+            "content_text": item.content_text,
+            "image_url": item.image_url,
+            "scheduled_at": item.scheduled_at,
+            "status": "scheduled" if item.scheduled_at else "draft",
+        })
+        # Publications are created for scheduled posts only, as in create_post
+        if item.scheduled_at:
+            publication_rows.extend(
+                {"id": uuid4(), "post_id": post_id, "community_id": community_id, "status": "pending"}
+                for community_id in item.community_ids
+            )
+        results[index] = PostBatchItemResult(index=index, status="created", id=post_id)
+
+    failed = sum(1 for result in results if result.status == "error")
+    if all_or_nothing and failed:
+        for result in results:
+            if result.status == "created":
+                result.status, result.id = "skipped", None
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=PostBatchResponse(created=0, failed=failed, results=results).model_dump(mode="json"),
+        )
+
+    if post_rows:
+        # executemany with RETURNING is sent as multi-row INSERT ... VALUES ... RETURNING
+        inserted = await db.execute(
+            insert(Post.__table__).returning(Post.__table__.c.id, sort_by_parameter_order=True),
+            post_rows,
+        )
+        inserted_ids = inserted.scalars().all()
+        if publication_rows:
+            await db.execute(insert(PostPublication.__table__), publication_rows)
+        await refresh_post_documents(db, inserted_ids)
+        await adjust_post_counters(db, current_user.id, [(None, row["status"]) for row in post_rows])
+        await db.commit()
+        await posts_changed(current_user.id, [(row["id"], row["status"]) for row in post_rows])
+    else:
+        inserted_ids = []
+
+    return PostBatchResponse(created=len(inserted_ids), failed=failed, results=results)
+
+
+BULK_ACTIONS = ["reschedule", "cancel", "delete", "retry_failed"]
+# Status the affected posts end up in (None: deleted); reschedule keeps statuses
+BULK_NEW_STATUS = {"cancel": "draft", "delete": None, "retry_failed": "scheduled"}
+
+
+def _bulk_conditions(request: PostBulkOperation, user_id: UUID) -> list:
+    """WHERE conditions selecting the posts of a bulk operation."""
+    conditions = [Post.user_id == user_id]
+    if request.ids:
+        conditions.append(Post.id.in_(request.ids))
+
+    post_filter = request.filter
+    if post_filter:
+        if post_filter.status:
+            if post_filter.status not in VALID_POST_STATUSES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Status must be one of: {', '.join(VALID_POST_STATUSES)}",
+                )
+            conditions.append(Post.status == post_filter.status)
+        if post_filter.community_id:
+            conditions.append(
+                Post.id.in_(
+                    select(PostPublication.post_id).where(PostPublication.community_id == post_filter.community_id)
+                )
+            )
+        if post_filter.scheduled_from:
+            conditions.append(Post.scheduled_at >= post_filter.scheduled_from)
+        if post_filter.scheduled_to:
+            conditions.append(Post.scheduled_at <= post_filter.scheduled_to)
+    return conditions
+
+
+@router.post("/bulk", response_model=PostBulkResult)
+async def bulk_posts_operation(
+    request: PostBulkOperation,
+    current_user: User = Depends(require_extended_tier),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Apply an operation to many posts with set-based statements.
+
+    Actions:
+    - reschedule: shift scheduled_at of draft/scheduled posts by offset_minutes
+      (posts that would leave the allowed scheduling window are skipped)
+    - cancel: turn scheduled posts back into drafts
+    - delete: delete draft/scheduled posts
+    - retry_failed: requeue failed publications of failed/partially published posts
+
+    Each action is one UPDATE/DELETE ... RETURNING on posts plus one statement for
+    publications and one for queued scheduled tasks, all in one transaction.
+    """
+    if request.action not in BULK_ACTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"action must be one of: {', '.join(BULK_ACTIONS)}",
+        )
+    if not request.ids and request.filter is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either ids or filter is required",
+        )
 
-    return PostResponse.model_validate(post_dict)
+    conditions = _bulk_conditions(request, current_user.id)
+    now = datetime.now(timezone.utc)
+    # Status of the affected posts before the statement (for the status counters)
+    previous_status = Post.status
+
+    if request.action == "reschedule":
+        if not request.offset_minutes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="offset_minutes is required for reschedule",
+            )
+        offset = timedelta(minutes=request.offset_minutes)
+        # Same window as validate_scheduled_at, checked on the shifted value in SQL
+        statement = (
+            update(Post)
+            .where(
+                *conditions,
+                Post.status.in_(["draft", "scheduled"]),
+                Post.scheduled_at.isnot(None),
+                Post.scheduled_at + offset > now,
+                Post.scheduled_at + offset <= now + timedelta(days=30),
+            )
+            .values(scheduled_at=Post.scheduled_at + offset, updated_at=func.now())
+        )
+    elif request.action == "cancel":
+        statement = (
+            update(Post)
+            .where(*conditions, Post.status == "scheduled")
+            .values(status="draft", scheduled_at=None, updated_at=func.now())
+        )
+        previous_status = literal("scheduled")
+    elif request.action == "delete":
+        statement = delete(Post).where(*conditions, Post.status.in_(["draft", "scheduled"]))
+    else:
+        # UPDATE ... FROM its own pre-image, so RETURNING can report the old status;
+        # rows whose status changed concurrently no longer match and are skipped.
+        previous = (
+            select(Post.id, Post.status)
+            .where(*conditions, Post.status.in_(["failed", "partially_published"]))
+            .subquery("previous")
+        )
+        statement = (
+            update(Post)
+            .where(Post.id == previous.c.id, Post.status == previous.c.status)
+            .values(status="scheduled", error_message=None, updated_at=func.now())
+        )
+        previous_status = previous.c.status
+
+    result = await db.execute(
+        statement.returning(Post.id, previous_status).execution_options(synchronize_session=False)
+    )
+    affected_rows = result.all()
+    affected_ids = [post_id for post_id, _ in affected_rows]
+
+    if affected_ids:
+        pending_tasks = (
+            update(ScheduledTask)
+            .where(
+                ScheduledTask.post_id.in_(affected_ids),
+                ScheduledTask.task_type == "publish_post",
+                ScheduledTask.status == "pending",
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if request.action == "reschedule":
+            await db.execute(
+                pending_tasks.values(scheduled_at=ScheduledTask.scheduled_at + offset, updated_at=func.now())
+            )
+        elif request.action == "cancel":
+            await db.execute(pending_tasks.values(status="cancelled", updated_at=func.now()))
+        elif request.action == "retry_failed":
+            await db.execute(
+                update(PostPublication)
+                .where(PostPublication.post_id.in_(affected_ids), PostPublication.status == "failed")
+                .values(
+                    status="pending",
+                    error_message=None,
+                    retry_count=PostPublication.retry_count + 1,
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.execute(
+                update(ScheduledTask)
+                .where(
+                    ScheduledTask.post_id.in_(affected_ids),
+                    ScheduledTask.task_type == "publish_post",
+                    ScheduledTask.status == "failed",
+                )
+                .values(status="pending", scheduled_at=now, error_message=None, updated_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        # delete: publications, scheduled tasks and documents are removed by ON DELETE CASCADE
+        if request.action != "delete":
+            await refresh_post_documents(db, affected_ids)
+
+        if request.action in BULK_NEW_STATUS:
+            new_status = BULK_NEW_STATUS[request.action]
+            await adjust_post_counters(
+                db, current_user.id, [(old_status, new_status) for _, old_status in affected_rows]
+            )
+
+    await db.commit()
+    if affected_ids:
+        statuses = []
+        if request.action in BULK_NEW_STATUS:
+            new_status = BULK_NEW_STATUS[request.action] or "deleted"
+            statuses = [(post_id, new_status) for post_id in affected_ids]
+        await posts_changed(current_user.id, statuses)
+
+    skipped_ids = None
+    if request.ids:
+        affected = set(affected_ids)
+        skipped_ids = [post_id for post_id in dict.fromkeys(request.ids) if post_id not in affected]
+
+    return PostBulkResult(
+        action=request.action,
+        affected=len(affected_ids),
+        ids=affected_ids,
+        skipped_ids=skipped_ids,
+    )
 
 
 @router.patch("/{post_id}", response_model=PostResponse)
@@ -342,6 +1046,7 @@ async def update_post(
     # Validate scheduled_at if provided
     new_scheduled_at = request.scheduled_at if request.scheduled_at is not None else post.scheduled_at
     validate_scheduled_at(new_scheduled_at)
+    old_status = post.status
 
     # Update fields
     if request.content_text is not None:
@@ -358,10 +1063,12 @@ async def update_post(
 
     # Update publications if community_ids provided
     if request.community_ids is not None:
+        requested_ids = list(dict.fromkeys(request.community_ids))
+
         # Validate communities
         communities_result = await db.execute(
             select(Community).where(
-                Community.id.in_(request.community_ids),
+                Community.id.in_(requested_ids),
                 Community.user_id == current_user.id,
                 Community.deleted_at.is_(None),
                 Community.is_active == True,
@@ -369,66 +1076,42 @@ async def update_post(
         )
         communities = communities_result.scalars().all()
 
-        if len(communities) != len(request.community_ids):
+        if len(communities) != len(requested_ids):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="One or more communities not found or not active",
             )
 
-        # Delete existing publications
-        existing_pubs_result = await db.execute(
-            select(PostPublication).where(PostPublication.post_id == post.id)
+        # Reconcile publications against the requested set: drop the ones
+        # no longer targeted, add the missing ones. Untouched publications
+        # keep their rows (status, external ids, retry counters).
+        await db.execute(
+            delete(PostPublication)
+            .where(
+                PostPublication.post_id == post.id,
+                PostPublication.community_id.not_in(requested_ids),
+            )
+            .execution_options(synchronize_session=False)
         )
-        existing_pubs = existing_pubs_result.scalars().all()
-        for pub in existing_pubs:
-            await db.delete(pub)
-
-        # Create new publications
-        for community_id in request.community_ids:
-            publication = PostPublication(
-                post_id=post.id,
-                community_id=community_id,
-                status="pending",
+        await db.execute(
+            pg_insert(PostPublication)
+            .values(
+                [
+                    {"id": uuid4(), "post_id": post.id, "community_id": community_id, "status": "pending"}
+                    for community_id in requested_ids
+                ]
             )
-            db.add(publication)
+            .on_conflict_do_nothing(index_elements=["post_id", "community_id"])
+        )
 
+    await refresh_post_documents(db, [post.id])
+    await adjust_post_counters(db, current_user.id, [(old_status, post.status)])
     await db.commit()
     await db.refresh(post)
+    await posts_changed(current_user.id, [(post.id, post.status)] if post.status != old_status else ())
 
-    # Get publications for response
-    pub_result = await db.execute(
-        select(PostPublication, Community)
-        .join(Community, PostPublication.community_id == Community.id)
-        .where(PostPublication.post_id == post.id)
-    )
-    publications_data = pub_result.all()
-
-    publications = []
-    for pub, community in publications_data:
-        publications.append({
-            "id": pub.id,
-            "community_id": pub.community_id,
-            "community_name": community.name,
-            "platform": community.platform,
-            "status": pub.status,
-            "external_post_id": pub.external_post_id,
-            "published_at": pub.published_at,
-            "error_message": pub.error_message,
-        })
-
-    post_dict = {
-        "id": post.id,
-        "content_text": post.content_text,
-        "image_url": post.image_url,
-        "scheduled_at": post.scheduled_at,
-        "status": post.status,
-        "error_message": post.error_message,
-        "created_at": post.created_at,
-        "updated_at": post.updated_at,
-        "publications": publications,
-    }
-
-    return PostResponse.model_validate(post_dict)
+    publications = await _publications_by_post(db, [post.id])
+    return model_response(PostResponse, _post_response(post, publications[post.id]))
 
 
 @router.delete("/{post_id}")
@@ -458,7 +1141,9 @@ async def delete_post(
 
     # TODO: Cancel scheduled task if exists
 
+    await adjust_post_counters(db, current_user.id, [(post.status, None)])
     await db.delete(post)
     await db.commit()
+    await posts_changed(current_user.id, [(post_id, "deleted")])
 
     return {"message": "Post deleted successfully"}
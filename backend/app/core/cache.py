@@ -0,0 +1,105 @@
+"""Redis-backed response cache.
+
+Cache failures never fail a request: on any Redis error reads miss and writes are
+skipped, so the API keeps working (uncached) when Redis is down.
+"""
+
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Redis | None = None
+
+
+def get_redis() -> Redis:
+    """Shared Redis client (connection pool is created lazily)."""
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.redis_url,
+            socket_timeout=settings.redis_socket_timeout_seconds,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def cache_hget(key: str, field: str) -> bytes | None:
+    """Read a cached entry from a per-owner hash."""
+    if not settings.cache_enabled:
+        return None
+    try:
+        return await get_redis().hget(key, field)
+    except RedisError as e:
+        logger.warning(f"[CACHE] Read failed for {key}: {e}")
+        return None
+
+
+async def cache_hset(key: str, field: str, value: bytes | str, ttl_seconds: int) -> None:
+    """Store an entry in a per-owner hash; the whole hash expires after ttl_seconds."""
+    if not settings.cache_enabled:
+        return
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.hset(key, field, value)
+            pipe.expire(key, ttl_seconds)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"[CACHE] Write failed for {key}: {e}")
+
+
+async def cache_get(key: str) -> bytes | None:
+    """Read a plain cached value."""
+    if not settings.cache_enabled:
+        return None
+    try:
+        return await get_redis().get(key)
+    except RedisError as e:
+        logger.warning(f"[CACHE] Read failed for {key}: {e}")
+        return None
+
+
+async def cache_incr(key: str, ttl_seconds: int) -> None:
+    """Bump a counter (e.g. a cache generation); it expires ttl_seconds after the last bump."""
+    if not settings.cache_enabled:
+        return
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl_seconds)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"[CACHE] Increment failed for {key}: {e}")
+
+
+async def cache_delete(*keys: str) -> None:
+    """Drop cached entries."""
+    if not settings.cache_enabled or not keys:
+        return
+    try:
+        await get_redis().delete(*keys)
+    except RedisError as e:
+        logger.warning(f"[CACHE] Invalidation failed for {keys}: {e}")
+
+
+async def cache_lock(key: str, ttl_seconds: int) -> bool:
+    """Take a short-lived lock (SET NX EX); False when it is held or Redis is unavailable."""
+    if not settings.cache_enabled:
+        return False
+    try:
+        return bool(await get_redis().set(key, b"1", nx=True, ex=ttl_seconds))
+    except RedisError as e:
+        logger.warning(f"[CACHE] Lock failed for {key}: {e}")
+        return False
@@ -23,6 +23,73 @@ class Settings(BaseSettings):
         """Construct database URL from components."""
         return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
 
+    # Optional streaming read replica (same credentials and database as the primary)
+    postgres_replica_host: str | None = None
+    postgres_replica_port: int = 5432
+    # Reads fall back to the primary when the replica lags more than this
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_interval_seconds: float = 2.0
+    replica_lag_check_timeout_seconds: float = 1.0
+    # Reads of a user stay on the primary for this long after the user wrote
+    replica_read_your_writes_seconds: float = 10.0
+
+    @property
+    def replica_database_url(self) -> str | None:
+        """Construct read replica URL, if a replica is configured."""
+        if not self.postgres_replica_host:
+            return None
+        return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_replica_host}:{self.postgres_replica_port}/{self.postgres_db}"
+
+    # Bulk post import (POST /posts/batch)
+    posts_batch_max_items: int = 1000
+
+    # Post read model rebuild (rebuild_post_read_model.py)
+    post_read_model_batch_size: int = 1000
+    post_read_model_pause_seconds: float = 0.1
+
+    # Post status counters reconciliation (reconcile_post_counters.py)
+    post_counters_reconcile_batch_size: int = 500
+
+    # Post history export (GET /posts/export): rows fetched per server-side cursor batch
+    posts_export_batch_size: int = 500
+
+    # Calendar ICS feed: how far back past posts are included
+    calendar_feed_past_days: int = 90
+
+    # Per-request SQL statistics (Server-Timing header, N+1 detection)
+    query_stats_enabled: bool = True
+    # Same statement shape executed this many times in one request is reported as N+1
+    n_plus_one_threshold: int = 5
+
+    # Database connection pools per workload class
+    # (statement timeout 0 disables the limit)
+    db_pool_interactive_size: int = 10
+    db_pool_interactive_max_overflow: int = 5
+    db_pool_interactive_timeout: float = 5.0
+    db_pool_interactive_statement_timeout_ms: int = 5000
+
+    db_pool_analytics_size: int = 5
+    db_pool_analytics_max_overflow: int = 2
+    db_pool_analytics_timeout: float = 10.0
+    db_pool_analytics_statement_timeout_ms: int = 30000
+
+    db_pool_background_size: int = 3
+    db_pool_background_max_overflow: int = 0
+    db_pool_background_timeout: float = 30.0
+    db_pool_background_statement_timeout_ms: int = 0
+
+    # Bearer token for internal endpoints (GET /health/db-pools); empty disables them
+    internal_metrics_token: str = ""
+
+    def db_pool_options(self, workload: str) -> dict:
+        """Pool settings of a workload class."""
+        return {
+            "pool_size": getattr(self, f"db_pool_{workload}_size"),
+            "max_overflow": getattr(self, f"db_pool_{workload}_max_overflow"),
+            "pool_timeout": getattr(self, f"db_pool_{workload}_timeout"),
+            "statement_timeout_ms": getattr(self, f"db_pool_{workload}_statement_timeout_ms"),
+        }
+
     # Security
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
@@ -30,6 +97,20 @@ class Settings(BaseSettings):
 
     # Encryption
     encryption_key: str = "your-encryption-key-change-in-production-32-chars!!"
+    # Retired keys that can still decrypt existing tokens (comma-separated, newest first)
+    encryption_keys_previous: str = ""
+
+    @property
+    def encryption_keys_list(self) -> list[str]:
+        """Current encryption key followed by retired keys still accepted for decryption."""
+        previous = [key.strip() for key in self.encryption_keys_previous.split(",") if key.strip()]
+        return [self.encryption_key, *previous]
+
+    # Encryption key rotation job
+    key_rotation_batch_size: int = 100
+    key_rotation_pause_seconds: float = 0.5
+    key_rotation_lock_timeout_ms: int = 2000
+    key_rotation_checkpoint_file: str = ".key_rotation_checkpoint.json"
 
     # Redis
     redis_host: str = "redis"
@@ -43,11 +124,33 @@ class Settings(BaseSettings):
             return f"redis://:{self.redis_password}@{self.redis_host}:{self.redis_port}"
         return f"redis://{self.redis_host}:{self.redis_port}"
 
+    redis_socket_timeout_seconds: float = 0.5
+
+    # Response caching (Redis)
+    cache_enabled: bool = True
+    calendar_density_cache_ttl_seconds: int = 3600
+    dashboard_cache_ttl_seconds: int = 86400
+    # Stale entries are served (and refreshed in the background) while their ingest
+    # watermark lags the current one by at most this much
+    dashboard_cache_stale_seconds: int = 300
+    dashboard_cache_refresh_lock_seconds: int = 30
+    # Dashboard windows at least this long are quantized to days, shorter ones to hours
+    dashboard_day_bucket_min_days: int = 7
+
+    # Live events (SSE over Redis pub/sub)
+    events_keepalive_seconds: float = 15.0
+    events_client_queue_size: int = 100
+    events_retry_ms: int = 3000
+    events_reconnect_seconds: float = 1.0
+    events_subscribe_timeout_seconds: float = 2.0
+
     # CORS
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
     
     # Frontend URL for password reset links
     frontend_url: str = "http://localhost:5173"
+    # Public API URL for links opened outside the SPA (calendar feeds)
+    api_public_url: str = "http://localhost:8000"
 
     @property
     def cors_origins_list(self) -> list[str]:
@@ -67,6 +170,22 @@ class Settings(BaseSettings):
     smtp_password: str = ""
     smtp_from_email: str = "noreply@publicboost.com"
     smtp_from_name: str = "Public Boost"
+    smtp_timeout_seconds: float = 30.0
+    # Outbound queue: persistent connections, batching and retries
+    smtp_pool_size: int = 2
+    smtp_batch_size: int = 20
+    smtp_queue_max_size: int = 1000
+    smtp_max_retries: int = 3
+    smtp_retry_backoff_seconds: float = 2.0
+
+    # Weekly analytics digest
+    digest_chunk_size: int = 500
+    digest_rate_per_second: float = 5.0
+    digest_output_dir: str = "digests"
+
+    # Columnar analytics export (GET /analytics/export): rows per record batch / row group
+    analytics_export_batch_size: int = 50000
+    analytics_export_max_days: int = 366
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,25 +1,100 @@
 """Database configuration and session management."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+import asyncio
+import logging
+import time
+from uuid import UUID
 
+from redis.exceptions import RedisError
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from app.core.cache import get_redis
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-)
+# Workload classes with isolated connection pools:
+# - interactive: auth and CRUD endpoints, short statements
+# - analytics: heavy dashboard/reporting queries
+# - background: jobs and scripts (key rotation, digests)
+WORKLOADS = ("interactive", "analytics", "background")
+# Workloads whose read-only endpoints may be served by the replica
+REPLICA_WORKLOADS = ("interactive", "analytics")
+# Redis key prefix of read-your-writes markers (expire after the pinning window)
+PRIMARY_PIN_PREFIX = "primary_pin:"
 
-# Create session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+logger = logging.getLogger(__name__)
+
+
+def create_workload_engine(workload: str, url: str | None = None, name: str | None = None) -> AsyncEngine:
+    """Create an engine with its own pool sized and limited for a workload class."""
+    options = settings.db_pool_options(workload)
+    name = name or workload
+    server_settings = {"application_name": f"public-boost-{name}"}
+    if options["statement_timeout_ms"]:
+        server_settings["statement_timeout"] = str(options["statement_timeout_ms"])
+
+    return create_async_engine(
+        url or settings.database_url,
+        echo=settings.debug,
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name=name,
+        pool_size=options["pool_size"],
+        max_overflow=options["max_overflow"],
+        pool_timeout=options["pool_timeout"],
+        pool_pre_ping=True,
+        connect_args={"server_settings": server_settings},
+    )
+
+
+# Create async engines
+engines: dict[str, AsyncEngine] = {workload: create_workload_engine(workload) for workload in WORKLOADS}
+engine = engines["interactive"]
+
+# Read replica engines (only when a replica is configured)
+replica_engines: dict[str, AsyncEngine] = {}
+if settings.replica_database_url:
+    replica_engines = {
+        workload: create_workload_engine(workload, url=settings.replica_database_url, name=f"replica-{workload}")
+        for workload in REPLICA_WORKLOADS
+    }
+
+
+class PrimaryPinningAsyncSession(AsyncSession):
+    """
+    AsyncSession that pins its user's reads to the primary after a committed write.
+
+    Sessions are marked as writing by the flush/execute listeners below and carry
+    the authenticated user in info["user_id"]. The marker is stored before commit()
+    returns, so the response of a write is never sent ahead of it.
+    """
+
+    async def commit(self) -> None:
+        await super().commit()
+        info = self.sync_session.info
+        if info.pop("has_writes", False) and info.get("user_id") is not None and replica_engines:
+            await replica_monitor.record_write(info["user_id"])
+
+
+def _create_session_factory(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Create session factory."""
+    return async_sessionmaker(
+        bind,
+        class_=PrimaryPinningAsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# Create session factories
+session_factories = {workload: _create_session_factory(engines[workload]) for workload in WORKLOADS}
+AsyncSessionLocal = session_factories["interactive"]
+replica_session_factories = {
+    workload: _create_session_factory(replica_engine) for workload, replica_engine in replica_engines.items()
+}
 
 
 class Base(DeclarativeBase):
@@ -29,9 +104,141 @@ class Base(DeclarativeBase):
 
 
 async def get_db() -> AsyncSession:
-    """Get database session."""
+    """Get database session (interactive pool)."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def get_analytics_db() -> AsyncSession:
+    """Get database session from the analytics pool."""
+    async with session_factories["analytics"]() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+# Replication lag query: 0 on a primary or a fully replayed replica, NULL if unknown
+REPLICATION_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Tracks replication lag and recent writes to decide where reads may go.
+
+    Lag is measured on the replica at most once per check interval and shared by all
+    requests; a failed check counts as unbounded lag. Recent writes are marked per
+    user in Redis with the read-your-writes window as TTL, so a user's next request
+    stays on the primary whichever API worker serves it. The writing process also
+    remembers them locally; when Redis cannot be asked, reads go to the primary.
+    """
+
+    def __init__(self):
+        self.lag_seconds: float | None = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._recent_writes: dict[UUID, float] = {}
+
+    async def record_write(self, user_id: UUID) -> None:
+        """Remember, for every worker, that a user has just written to the primary."""
+        now = time.monotonic()
+        self._recent_writes[user_id] = now
+        # Drop expired entries so the map stays bounded by active writers
+        if len(self._recent_writes) > 10000:
+            cutoff = now - settings.replica_read_your_writes_seconds
+            self._recent_writes = {uid: ts for uid, ts in self._recent_writes.items() if ts >= cutoff}
+        try:
+            await get_redis().set(
+                f"{PRIMARY_PIN_PREFIX}{user_id}",
+                b"1",
+                px=max(int(settings.replica_read_your_writes_seconds * 1000), 1),
+            )
+        except RedisError as e:
+            logger.warning(f"[DB] Read-your-writes marker not stored for {user_id}: {e}")
+
+    async def wrote_recently(self, user_id: UUID) -> bool:
+        """Whether the user wrote within the read-your-writes window (True if unknown)."""
+        written_at = self._recent_writes.get(user_id)
+        if written_at is not None and time.monotonic() - written_at < settings.replica_read_your_writes_seconds:
+            return True
+        try:
+            return bool(await get_redis().exists(f"{PRIMARY_PIN_PREFIX}{user_id}"))
+        except RedisError as e:
+            logger.warning(f"[DB] Read-your-writes marker check failed for {user_id}: {e}")
+            return True
+
+    async def _query_lag(self):
+        """Run the lag query on the replica."""
+        async with replica_engines["interactive"].connect() as conn:
+            return (await conn.execute(REPLICATION_LAG_SQL)).scalar_one()
+
+    async def current_lag(self) -> float | None:
+        """Replication lag in seconds (None if the replica is unreachable)."""
+        if time.monotonic() - self._checked_at < settings.replica_lag_check_interval_seconds:
+            return self.lag_seconds
+        async with self._lock:
+            if time.monotonic() - self._checked_at < settings.replica_lag_check_interval_seconds:
+                return self.lag_seconds
+            try:
+                lag = await asyncio.wait_for(self._query_lag(), timeout=settings.replica_lag_check_timeout_seconds)
+                self.lag_seconds = float(lag) if lag is not None else None
+            except Exception as e:
+                logger.warning(f"[DB] Replica lag check failed: {e}")
+                self.lag_seconds = None
+            self._checked_at = time.monotonic()
+        return self.lag_seconds
+
+    async def use_replica(self, user_id: UUID | None) -> bool:
+        """Whether reads for this user can be served by the replica right now."""
+        if not replica_engines:
+            return False
+        if user_id is not None and await self.wrote_recently(user_id):
+            return False
+        lag = await self.current_lag()
+        return lag is not None and lag <= settings.replica_max_lag_seconds
+
+
+replica_monitor = ReplicaMonitor()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session: Session, flush_context) -> None:
+    """Mark sessions that wrote through the unit of work."""
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state) -> None:
+    """Mark sessions that executed bulk INSERT/UPDATE/DELETE statements."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+async def get_read_session_factory(user_id: UUID | None, workload: str = "interactive") -> async_sessionmaker[AsyncSession]:
+    """Pick the replica or the primary session factory for a read-only request."""
+    if workload in replica_session_factories and await replica_monitor.use_replica(user_id):
+        return replica_session_factories[workload]
+    return session_factories[workload]
+
+
+def pool_status() -> dict[str, dict]:
+    """Saturation metrics of every workload pool."""
+    all_engines = {**engines, **{f"replica-{name}": e for name, e in replica_engines.items()}}
+    return {name: e.sync_engine.pool.status_snapshot() for name, e in all_engines.items()}
+
+
+async def dispose_engines() -> None:
+    """Close all pooled connections."""
+    for workload_engine in [*engines.values(), *replica_engines.values()]:
+        await workload_engine.dispose()
@@ -1,15 +1,234 @@
 """Email sending utilities."""
 
+import asyncio
 import logging
-import aiosmtplib
-from email.mime.text import MIMEText
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import aiosmtplib
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def build_message(
+    to_email: str,
+    subject: str,
+    html_body: str,
+    text_body: str | None = None,
+) -> MIMEMultipart:
+    """Build a MIME message with optional plain text alternative."""
+    message = MIMEMultipart("alternative")
+    message["Subject"] = subject
+    message["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
+    message["To"] = to_email
+
+    # Add text and HTML parts
+    if text_body:
+        message.attach(MIMEText(text_body, "plain", "utf-8"))
+    message.attach(MIMEText(html_body, "html", "utf-8"))
+    return message
+
+
+class SMTPConnectionPool:
+    """
+    Pool of persistent SMTP connections.
+
+    Connections are opened lazily (connect, STARTTLS/TLS and login happen once per
+    connection instead of once per email) and reused until the server drops them.
+    Credentials are optional, so the pool also works against a local debugging
+    server such as ``python -m aiosmtpd -n -l localhost:1025``.
+    """
+
+    def __init__(self, size: int | None = None):
+        self.size = size or settings.smtp_pool_size
+        self._idle: list[aiosmtplib.SMTP] = []
+        self._semaphore = asyncio.Semaphore(self.size)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open and authenticate a new connection."""
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            use_tls=settings.smtp_use_tls,
+            timeout=settings.smtp_timeout_seconds,
+        )
+        await smtp.connect()
+        if settings.smtp_user and settings.smtp_password:
+            await smtp.login(settings.smtp_user, settings.smtp_password)
+        return smtp
+
+    @asynccontextmanager
+    async def connection(self):
+        """Check out a live connection, reconnecting if the server closed it."""
+        async with self._semaphore:
+            smtp = self._idle.pop() if self._idle else None
+            if smtp is None or not smtp.is_connected:
+                smtp = await self._connect()
+            try:
+                yield smtp
+            except (aiosmtplib.SMTPServerDisconnected, ConnectionError, OSError):
+                smtp.close()
+                raise
+            finally:
+                if smtp.is_connected:
+                    self._idle.append(smtp)
+
+    async def close(self) -> None:
+        """Gracefully close all idle connections."""
+        while self._idle:
+            smtp = self._idle.pop()
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
+
+
+@dataclass
+class OutgoingEmail:
+    """Queued email with its delivery attempt counter."""
+
+    message: MIMEMultipart
+    attempts: int = 0
+
+
+class EmailQueue:
+    """
+    In-process outbound email queue.
+
+    Request handlers only enqueue messages; one sender task per pooled connection
+    drains the queue in batches, sends every batch over a single connection and
+    retries transient failures with exponential backoff. Permanent (5xx) rejections
+    are logged and dropped.
+    """
+
+    def __init__(self, pool: SMTPConnectionPool | None = None):
+        self.pool = pool or SMTPConnectionPool()
+        self._queue: asyncio.Queue[OutgoingEmail] = asyncio.Queue(maxsize=settings.smtp_queue_max_size)
+        self._senders: list[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+
+    @property
+    def running(self) -> bool:
+        """Whether sender tasks are running."""
+        return bool(self._senders)
+
+    def enqueue(self, message: MIMEMultipart) -> bool:
+        """Queue a message for delivery without waiting for SMTP."""
+        try:
+            self._queue.put_nowait(OutgoingEmail(message))
+        except asyncio.QueueFull:
+            logger.error(f"[EMAIL] Queue is full, dropping email to {message['To']}")
+            return False
+        return True
+
+    async def start(self) -> None:
+        """Start sender tasks."""
+        if self.running:
+            return
+        self._senders = [asyncio.create_task(self._sender()) for _ in range(self.pool.size)]
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """Flush queued emails and pending retries (bounded by drain_timeout), then stop sender tasks."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self.join(), timeout=drain_timeout)
+        except TimeoutError:
+            logger.warning(f"[EMAIL] {self._queue.qsize()} emails left unsent on shutdown")
+        if self._retries:
+            logger.warning(f"[EMAIL] Dropping {len(self._retries)} pending email retries on shutdown")
+        for handle in self._retries:
+            handle.cancel()
+        self._retries.clear()
+        for task in self._senders:
+            task.cancel()
+        await asyncio.gather(*self._senders, return_exceptions=True)
+        self._senders = []
+        await self.pool.close()
+
+    async def join(self) -> None:
+        """Wait until every queued email has been processed, including pending retries."""
+        loop = asyncio.get_running_loop()
+        await self._queue.join()
+        while self._retries:
+            # A retry requeues its email when it fires; failing again schedules the
+            # next one before the email is marked done
+            await asyncio.sleep(min(handle.when() for handle in self._retries) - loop.time())
+            await self._queue.join()
+
+    async def _next_batch(self) -> list[OutgoingEmail]:
+        """Wait for one email, then take whatever else is queued up to the batch size."""
+        batch = [await self._queue.get()]
+        while len(batch) < settings.smtp_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    def _schedule_retry(self, item: OutgoingEmail, error: Exception) -> None:
+        """Requeue a failed email after a backoff delay, or give up."""
+        item.attempts += 1
+        if item.attempts > settings.smtp_max_retries:
+            logger.error(f"[EMAIL] Giving up on email to {item.message['To']}: {error}")
+            return
+        delay = settings.smtp_retry_backoff_seconds * 2 ** (item.attempts - 1)
+        logger.warning(f"[EMAIL] Retrying email to {item.message['To']} in {delay}s: {error}")
+
+        def requeue() -> None:
+            self._retries.discard(handle)
+            # Counted as unfinished again until the retry is processed
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                logger.error(f"[EMAIL] Queue is full, dropping retry to {item.message['To']}")
+
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._retries.add(handle)
+
+    async def _send_batch(self, batch: list[OutgoingEmail]) -> None:
+        """Send a batch over one pooled connection."""
+        pending = list(batch)
+        try:
+            async with self.pool.connection() as smtp:
+                while pending:
+                    item = pending[0]
+                    try:
+                        await smtp.send_message(item.message)
+                        logger.info(f"[EMAIL] Successfully sent email to {item.message['To']}")
+                    except aiosmtplib.SMTPResponseException as e:
+                        if e.code >= 500:
+                            logger.error(f"[EMAIL] Email to {item.message['To']} rejected: {e}")
+                        else:
+                            self._schedule_retry(item, e)
+                    except aiosmtplib.SMTPRecipientsRefused as e:
+                        logger.error(f"[EMAIL] Email to {item.message['To']} rejected: {e}")
+                    pending.pop(0)
+        except (aiosmtplib.SMTPException, ConnectionError, OSError) as e:
+            # Connection-level failure: everything not yet sent goes back for retry
+            for item in pending:
+                self._schedule_retry(item, e)
+
+    async def _sender(self) -> None:
+        """Sender loop."""
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._send_batch(batch)
+            except Exception as e:
+                logger.error(f"[EMAIL] Error sending email batch: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+email_queue = EmailQueue()
+
+
 async def send_email(
     to_email: str,
     subject: str,
@@ -17,7 +236,7 @@ async def send_email(
     text_body: str | None = None,
 ) -> bool:
     """
-    Send email via SMTP.
+    Queue an email for delivery via SMTP.
 
     Args:
         to_email: Recipient email address
@@ -26,7 +245,7 @@ async def send_email(
         text_body: Plain text email body (optional)
 
     Returns:
-        True if email was sent successfully, False otherwise
+        True if email was queued successfully, False otherwise
     """
     if not settings.smtp_enabled:
         # In development, just log instead of sending
@@ -34,40 +253,11 @@ async def send_email(
         logger.info(f"[EMAIL] Body: {html_body}")
         return True
 
-    if not settings.smtp_user or not settings.smtp_password:
+    if bool(settings.smtp_user) != bool(settings.smtp_password):
         logger.warning("[EMAIL] SMTP credentials not configured")
         return False
 
-    try:
-        # Create message
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
-        message["To"] = to_email
-
-        # Add text and HTML parts
-        if text_body:
-            text_part = MIMEText(text_body, "plain", "utf-8")
-            message.attach(text_part)
-
-        html_part = MIMEText(html_body, "html", "utf-8")
-        message.attach(html_part)
-
-        # Send email
-        await aiosmtplib.send(
-            message,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            use_tls=settings.smtp_use_tls,
-            username=settings.smtp_user,
-            password=settings.smtp_password,
-        )
-
-        logger.info(f"[EMAIL] Successfully sent email to {to_email}")
-        return True
-    except Exception as e:
-        logger.error(f"[EMAIL] Error sending email: {e}")
-        return False
+    return email_queue.enqueue(build_message(to_email, subject, html_body, text_body))
 
 
 async def send_password_reset_email(email: str, reset_token: str, reset_url: str) -> bool:
@@ -80,7 +270,7 @@ async def send_password_reset_email(email: str, reset_token: str, reset_url: str
         reset_url: Full URL for password reset page
 
     Returns:
-        True if email was sent successfully
+        True if email was queued successfully
     """
     subject = "Восстановление пароля - Public Boost"
 
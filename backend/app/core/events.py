@@ -0,0 +1,158 @@
+"""Live per-user events over Redis pub/sub (Server-Sent Events fan-out).
+
+Writers (API handlers, publication workers) publish to the user's channel with
+publish_user_events(). Every API process keeps a single pattern subscription and
+hands each message to the queues of that user's connected clients in the process.
+Publishing never fails a request: on Redis errors events are dropped and logged.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.cache import get_redis
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "user_events:"
+
+# Tells clients that events may have been lost and they should refetch once
+RESYNC_FRAME = "event: resync\ndata: {}\n\n"
+
+
+def user_events_channel(user_id: UUID) -> str:
+    """Redis pub/sub channel of a user's events."""
+    return f"{CHANNEL_PREFIX}{user_id}"
+
+
+def sse_frame(event: str, data: dict) -> str:
+    """One Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def publish_user_events(user_id: UUID, events: Iterable[tuple[str, dict]]) -> None:
+    """Publish (event, data) pairs to a user's channel in one round trip."""
+    events = list(events)
+    if not events:
+        return
+    channel = user_events_channel(user_id)
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for event, data in events:
+                pipe.publish(channel, sse_frame(event, data))
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"[EVENTS] Publish failed for {channel}: {e}")
+
+
+class EventHub:
+    """
+    Per-process fan-out of user events to SSE clients.
+
+    One listener task holds one PSUBSCRIBE on every user channel and is started by
+    the first client. Messages are already SSE frames; they are copied to the bounded
+    queue of each local client of the user. A client that falls behind has its
+    backlog replaced by a resync event, and all clients get one after the
+    subscription is re-established (messages published meanwhile are lost).
+    """
+
+    def __init__(self):
+        self._clients: dict[str, set[asyncio.Queue[str]]] = {}
+        self._listener: asyncio.Task | None = None
+        self._subscribed = asyncio.Event()
+
+    @property
+    def client_count(self) -> int:
+        """Number of connected clients in this process."""
+        return sum(len(queues) for queues in self._clients.values())
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: UUID) -> AsyncIterator[asyncio.Queue[str]]:
+        """Register a client of the user; yields the queue its frames arrive on."""
+        key = str(user_id)
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=settings.events_client_queue_size)
+        self._clients.setdefault(key, set()).add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            # The first client waits until the subscription is live, so nothing
+            # published after it was told "ready" is missed
+            try:
+                await asyncio.wait_for(self._subscribed.wait(), timeout=settings.events_subscribe_timeout_seconds)
+            except TimeoutError:
+                logger.warning("[EVENTS] Subscription is not ready yet")
+            yield queue
+        finally:
+            queues = self._clients.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._clients[key]
+
+    async def stop(self) -> None:
+        """Stop the listener task."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    @staticmethod
+    def _put(queue: asyncio.Queue[str], frame: str) -> None:
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Slow client: drop its backlog and ask it to refetch instead
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_FRAME)
+
+    def _dispatch(self, channel: str, frame: str) -> None:
+        for queue in self._clients.get(channel.removeprefix(CHANNEL_PREFIX), ()):
+            self._put(queue, frame)
+
+    def _broadcast(self, frame: str) -> None:
+        for queues in self._clients.values():
+            for queue in queues:
+                self._put(queue, frame)
+
+    async def _listen(self) -> None:
+        """Listener loop: (re)subscribe and dispatch until cancelled."""
+        # Dedicated connection without the cache's short socket timeout: the
+        # subscription is idle between events. Health checks detect dead links.
+        redis = Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+            health_check_interval=settings.events_keepalive_seconds,
+        )
+        reconnecting = False
+        try:
+            while True:
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                try:
+                    await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                    self._subscribed.set()
+                    if reconnecting:
+                        self._broadcast(RESYNC_FRAME)
+                    while True:
+                        message = await pubsub.get_message(timeout=settings.events_keepalive_seconds)
+                        if message is not None and message["type"] == "pmessage":
+                            self._dispatch(message["channel"].decode(), message["data"].decode())
+                except (RedisError, OSError) as e:
+                    logger.warning(f"[EVENTS] Subscription lost: {e}")
+                finally:
+                    self._subscribed.clear()
+                    await pubsub.aclose()
+                reconnecting = True
+                await asyncio.sleep(settings.events_reconnect_seconds)
+        finally:
+            await redis.aclose()
+
+
+event_hub = EventHub()
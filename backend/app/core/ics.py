@@ -0,0 +1,90 @@
+"""iCalendar (RFC 5545) formatting utilities."""
+
+from datetime import datetime, timezone
+
+
+def escape_text(value: str) -> str:
+    """Escape a TEXT property value."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line to 75 octets per physical line, terminated by CRLF."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Do not split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        # Continuation lines start with a space, which counts towards the limit
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a datetime as a UTC DATE-TIME value."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name: str, tz_name: str) -> str:
+    """VCALENDAR opening lines."""
+    return "".join(
+        fold_line(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Public Boost//Content Calendar//RU",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{escape_text(name)}",
+            f"X-WR-TIMEZONE:{tz_name}",
+        )
+    )
+
+
+def calendar_footer() -> str:
+    """VCALENDAR closing line."""
+    return fold_line("END:VCALENDAR")
+
+
+def event(
+    uid: str,
+    start: datetime,
+    end: datetime,
+    stamp: datetime,
+    summary: str,
+    description: str,
+    status: str | None = None,
+    categories: list[str] | None = None,
+) -> str:
+    """Render a VEVENT component."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_datetime(stamp)}",
+        f"DTSTART:{format_datetime(start)}",
+        f"DTEND:{format_datetime(end)}",
+        f"SUMMARY:{escape_text(summary)}",
+        f"DESCRIPTION:{escape_text(description)}",
+    ]
+    if status:
+        lines.append(f"STATUS:{status}")
+    if categories:
+        lines.append(f"CATEGORIES:{','.join(escape_text(c) for c in categories)}")
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
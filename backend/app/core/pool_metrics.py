@@ -0,0 +1,91 @@
+"""In-process connection pool saturation metrics."""
+
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Upper bounds of checkout wait histogram buckets, in seconds
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class Histogram:
+    """Cumulative histogram with fixed buckets (Prometheus semantics)."""
+
+    buckets: tuple[float, ...] = CHECKOUT_WAIT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    sum: float = 0.0
+
+    def __post_init__(self) -> None:
+        # One extra slot for +Inf
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound."""
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*self.buckets, float("inf")), self.counts, strict=True):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"buckets": buckets, "count": self.count, "sum": round(self.sum, 6)}
+
+
+@dataclass
+class PoolMetrics:
+    """Checkout metrics of one named pool."""
+
+    name: str
+    checkout_wait: Histogram = field(default_factory=Histogram)
+    checkout_timeouts: int = 0
+    max_in_use: int = 0
+
+
+# Metrics registry keyed by pool name
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waited.
+
+    Metrics are looked up by the pool's logging_name (``pool_logging_name`` of the
+    engine), which survives pool recreation on engine.dispose().
+    """
+
+    def connect(self):
+        metrics = pool_metrics.setdefault(self.logging_name, PoolMetrics(self.logging_name))
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.checkout_timeouts += 1
+            raise
+        finally:
+            metrics.checkout_wait.observe(time.perf_counter() - start)
+        metrics.max_in_use = max(metrics.max_in_use, self.checkedout())
+        return connection
+
+    def status_snapshot(self) -> dict:
+        """Current gauges and accumulated metrics of the pool."""
+        metrics = pool_metrics.get(self.logging_name) or PoolMetrics(self.logging_name)
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "timeout": self._timeout,
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_in_use": metrics.max_in_use,
+            "checkout_timeouts": metrics.checkout_timeouts,
+            "checkout_wait_seconds": metrics.checkout_wait.snapshot(),
+        }
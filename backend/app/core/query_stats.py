@@ -0,0 +1,134 @@
+"""Per-request SQL statement statistics and N+1 detection."""
+
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+# Bind placeholders (asyncpg $1, named :param / %(param)s, qmark ?) with optional casts,
+# and expanded IN lists
+_PLACEHOLDER_RE = re.compile(r"(?:\$\d+|%\(\w+\)s|(?<!:):\w+|\?)(?:::\w+(?:\[\])?)?")
+_PLACEHOLDER_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions differing only in parameters compare equal."""
+    shape = _PLACEHOLDER_RE.sub("?", statement)
+    shape = _PLACEHOLDER_LIST_RE.sub("?", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within a tracking scope."""
+
+    parent: "QueryStats | None" = None
+    count: int = 0
+    duration: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record one executed statement here and in every enclosing scope."""
+        shape = statement_shape(statement)
+        stats: QueryStats | None = self
+        while stats is not None:
+            stats.count += 1
+            stats.duration += duration
+            stats.shapes[shape] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int | None = None) -> list[tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times (likely N+1)."""
+        threshold = threshold or settings.n_plus_one_threshold
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+def current_stats() -> QueryStats | None:
+    """Statistics of the innermost active tracking scope."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in this context (scopes nest)."""
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    if stats is not None and conn.info.get("query_start"):
+        stats.record(statement, time.perf_counter() - conn.info["query_start"].pop())
+
+
+def server_timing_header(stats: QueryStats, total: float) -> str:
+    """Render a Server-Timing header value."""
+    parts = [
+        f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+        f"app;dur={total * 1000:.1f}",
+    ]
+    repeated = stats.repeated()
+    if repeated:
+        parts.append(f'n-plus-one;desc="{len(repeated)} shapes, max {repeated[0][1]}x"')
+    return ", ".join(parts)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware adding a Server-Timing header with SQL statement count and time.
+
+    Requests in which the same statement shape runs n_plus_one_threshold times or more
+    are logged as probable N+1 query patterns.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.query_stats_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with track_queries() as stats:
+
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    header = server_timing_header(stats, time.perf_counter() - start)
+                    message.setdefault("headers", [])
+                    message["headers"] = [*message["headers"], (b"server-timing", header.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                for shape, count in stats.repeated():
+                    logger.warning(
+                        f"[SQL] Possible N+1 in {scope['method']} {scope['path']}: "
+                        f"{count}x {shape[:200]}"
+                    )
@@ -7,20 +7,29 @@ from base64 import urlsafe_b64encode
 from hashlib import sha256
 
 import bcrypt
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from jose import JWTError, jwt
 
 from app.core.config import settings
 
-# Token encryption - generate Fernet key from settings
-def _get_fernet_key() -> bytes:
-    """Generate Fernet key from settings encryption_key."""
-    key = settings.encryption_key.encode()
+# Token encryption - generate Fernet keys from settings
+def _derive_fernet_key(secret: str) -> bytes:
+    """Derive a Fernet key from an arbitrary secret string."""
     # Hash to 32 bytes and encode as base64 URL-safe
-    hashed = sha256(key).digest()
+    hashed = sha256(secret.encode()).digest()
     return urlsafe_b64encode(hashed)
 
-fernet = Fernet(_get_fernet_key())
+
+def _get_fernet_key() -> bytes:
+    """Generate Fernet key from settings encryption_key."""
+    return _derive_fernet_key(settings.encryption_key)
+
+
+# The first key encrypts, every key (current and retired) decrypts
+_primary_fernet = Fernet(_get_fernet_key())
+fernet = MultiFernet(
+    [_primary_fernet, *(Fernet(_derive_fernet_key(key)) for key in settings.encryption_keys_list[1:])]
+)
 
 
 def hash_password(password: str) -> str:
@@ -72,3 +81,17 @@ def decrypt_token(encrypted_token: str) -> str:
     """Decrypt a stored token."""
     return fernet.decrypt(encrypted_token.encode()).decode()
 
+
+def is_encrypted_with_current_key(encrypted_token: str) -> bool:
+    """Check whether a stored token is already encrypted with the current key."""
+    try:
+        _primary_fernet.decrypt(encrypted_token.encode())
+    except InvalidToken:
+        return False
+    return True
+
+
+def rotate_token(encrypted_token: str) -> str:
+    """Re-encrypt a stored token with the current key."""
+    return fernet.rotate(encrypted_token.encode()).decode()
+
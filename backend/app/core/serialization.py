@@ -0,0 +1,77 @@
+"""Fast JSON serialization of trusted data.
+
+Response models built from database rows are already valid, so handlers construct
+them without validation and serialize them straight to JSON bytes through a cached
+TypeAdapter, skipping FastAPI's second validation pass against `response_model`.
+Plain dict payloads go through orjson, which handles UUID/datetime natively, and
+documents stored as JSON (post read model) are spliced into the body as they are.
+"""
+
+from functools import cache
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@cache
+def type_adapter(model_type: Any) -> TypeAdapter:
+    """TypeAdapter per response type, built once per process."""
+    return TypeAdapter(model_type)
+
+
+def model_response(
+    model_type: Any,
+    value: Any,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Serialize a constructed (already valid) response model to a JSON response."""
+    return Response(
+        content=type_adapter(model_type).dump_json(value),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def document_response(
+    document: str,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Serve a stored JSON document without decoding it."""
+    return Response(
+        content=document.encode(),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def document_list_response(
+    documents: list[str],
+    pagination: dict,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Paginated list response built from stored JSON documents."""
+    return Response(content=document_list_json(documents, pagination), headers=headers, media_type="application/json")
+
+
+def document_list_json(documents: list[str], pagination: dict) -> bytes:
+    """{"data": [...documents], "pagination": {...}} as JSON bytes."""
+    return b'{"data":[' + ",".join(documents).encode() + b'],"pagination":' + orjson.dumps(pagination) + b"}"
+
+
+def json_object(members: dict[str, bytes]) -> bytes:
+    """JSON object from already serialized member values."""
+    return b"{" + b",".join(orjson.dumps(name) + b":" + value for name, value in members.items()) + b"}"
@@ -2,12 +2,17 @@
 
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import auth
+from app.api.dependencies import require_internal_token
+from app.core.cache import close_redis
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core.database import dispose_engines, pool_status
+from app.core.email import email_queue
+from app.core.events import event_hub
+from app.core.query_stats import QueryStatsMiddleware
 
 
 @asynccontextmanager
@@ -17,9 +22,14 @@ async def lifespan(app: FastAPI):
     # Create tables (for development only, use migrations in production)
     # async with engine.begin() as conn:
     #     await conn.run_sync(Base.metadata.create_all)
+    if settings.smtp_enabled:
+        await email_queue.start()
     yield
     # Shutdown
-    await engine.dispose()
+    await event_hub.stop()
+    await email_queue.stop()
+    await close_redis()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -37,15 +47,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# SQL statement statistics (Server-Timing header)
+app.add_middleware(QueryStatsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
-from app.api import users, communities, posts, analytics, calendar, upload
+from app.api import users, communities, posts, analytics, calendar, upload, events, bootstrap
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(communities.router, prefix="/api/v1")
 app.include_router(posts.router, prefix="/api/v1")
 app.include_router(analytics.router, prefix="/api/v1")
 app.include_router(calendar.router, prefix="/api/v1")
 app.include_router(upload.router, prefix="/api/v1")
+app.include_router(events.router, prefix="/api/v1")
+app.include_router(bootstrap.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -59,3 +74,9 @@ async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+
+
+@app.get("/health/db-pools", dependencies=[Depends(require_internal_token)])
+async def health_db_pools():
+    """Connection pool saturation metrics per workload (internal: requires the metrics token)."""
+    return {"pools": pool_status()}
@@ -1,7 +1,7 @@
 """Database models."""
 
 from app.models.community import Community
-from app.models.post import Post, PostPublication
+from app.models.post import Post, PostPublication, PostReadModel, UserPostCounter
 from app.models.user import User
 from app.models.analytics import AnalyticsSnapshot
 from app.models.task import ScheduledTask
@@ -11,6 +11,8 @@ __all__ = [
     "Community",
     "Post",
     "PostPublication",
+    "PostReadModel",
+    "UserPostCounter",
     "AnalyticsSnapshot",
     "ScheduledTask",
 ]
@@ -3,7 +3,8 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import ForeignKey, String, Text, func, Index
+from sqlalchemy import Column, Computed, ForeignKey, String, Text, UniqueConstraint, func, Index
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -17,6 +18,11 @@ class Post(Base):
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     content_text: Mapped[str] = mapped_column(Text, nullable=False)
+    # First line of content_text (at most 200 chars) for list views, maintained by Postgres
+    content_preview: Mapped[str] = mapped_column(
+        String(200),
+        Computed("left(split_part(content_text, E'\\n', 1), 200)", persisted=True),
+    )
     image_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     image_storage_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
     scheduled_at: Mapped[datetime | None] = mapped_column(nullable=True, index=True)
@@ -24,6 +30,12 @@ class Post(Base):
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Full-text search document, generated by Postgres. Kept out of the mapper so it is
+    # never loaded or fetched back after writes; Post.search_vector is the table column.
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('russian'::regconfig, content_text)", persisted=True),
+    )
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="posts")
@@ -31,11 +43,20 @@ class Post(Base):
         "PostPublication", back_populates="post", cascade="all, delete-orphan"
     )
 
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
+
     # Indexes
     __table_args__ = (
         Index("idx_posts_user_status", "user_id", "status"),
         Index("idx_posts_scheduled_pending", "scheduled_at", "status", postgresql_where=(status == "scheduled")),
         Index("idx_posts_scheduled_at", "scheduled_at", postgresql_where=(scheduled_at.isnot(None))),
+        Index("idx_posts_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "idx_posts_content_trgm",
+            "content_text",
+            postgresql_using="gin",
+            postgresql_ops={"content_text": "gin_trgm_ops"},
+        ),
     )
 
 
@@ -63,6 +84,7 @@ class PostPublication(Base):
 
     # Indexes
     __table_args__ = (
+        UniqueConstraint("post_id", "community_id", name="unique_post_community"),
         Index("idx_post_publications_pending", "post_id", "status", postgresql_where=(status == "pending")),
         Index(
             "idx_post_publications_external_id",
@@ -71,3 +93,47 @@ class PostPublication(Base):
             postgresql_where=(external_post_id.isnot(None)),
         ),
     )
+
+
+class PostReadModel(Base):
+    """Ready-to-serve JSON document per post (post, preview, publications with communities).
+
+    Maintained in the writing transaction by app.services.post_read_model.
+    """
+
+    __tablename__ = "post_read_model"
+
+    post_id: Mapped[UUID] = mapped_column(ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    scheduled_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    document: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
+
+    # Indexes
+    __table_args__ = (
+        Index("idx_post_read_model_user_created", "user_id", "created_at"),
+        Index("idx_post_read_model_user_status", "user_id", "status"),
+        Index(
+            "idx_post_read_model_user_scheduled",
+            "user_id",
+            "scheduled_at",
+            postgresql_where=(scheduled_at.isnot(None)),
+        ),
+    )
+
+
+class UserPostCounter(Base):
+    """Number of a user's posts in one status.
+
+    Adjusted in the writing transaction by app.services.post_counters and
+    reconciled against the posts table by reconcile_post_counters.py.
+    """
+
+    __tablename__ = "user_post_counters"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    count: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -63,8 +63,9 @@ class CommunityMetricDetail(BaseModel):
     """Detailed metric for a community."""
 
     metric_name: str
-    values: list[MetricValue]
-    trend: str  # 'up', 'down', 'stable'
+    values: list[MetricValue]  # Downsampled when max_points is given
+    total_points: int  # Points in the period before downsampling
+    trend: str  # 'up', 'down', 'stable' (least-squares fit over all points)
     change_percent: float
 
 
@@ -0,0 +1,27 @@
+"""Bootstrap schemas."""
+
+from pydantic import BaseModel
+
+from app.schemas.analytics import DashboardResponse
+from app.schemas.calendar import CalendarResponse
+from app.schemas.community import CommunityListResponse
+from app.schemas.post import PostListResponse
+from app.schemas.user import UserResponse
+
+
+class BootstrapSectionCache(BaseModel):
+    """Cache metadata of one bootstrap section, as its own endpoint would send it."""
+
+    etag: str | None  # Send as If-None-Match to the section's endpoint to revalidate
+    cache_control: str
+
+
+class BootstrapResponse(BaseModel):
+    """First-paint payload: the responses of the SPA's initial requests."""
+
+    user: UserResponse  # GET /users/me
+    communities: CommunityListResponse  # GET /communities
+    dashboard: DashboardResponse  # GET /analytics/dashboard
+    calendar: CalendarResponse | None  # GET /calendar (extended tier only)
+    scheduled_posts: PostListResponse | None  # GET /posts?status=scheduled (extended tier only)
+    cache: dict[str, BootstrapSectionCache]
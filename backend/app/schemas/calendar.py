@@ -1,6 +1,6 @@
 """Calendar schemas."""
 
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -20,13 +20,47 @@ class CalendarPost(BaseModel):
     id: UUID
     content_text: str
     scheduled_at: datetime
+    local_date: date
     status: str
     communities: list[CalendarCommunity]
 
 
+class CalendarDay(BaseModel):
+    """Posts of one day in the user's timezone."""
+
+    date: date
+    post_ids: list[UUID]
+
+
 class CalendarResponse(BaseModel):
     """Calendar response schema."""
 
     month: int
     year: int
+    timezone: str
     posts: list[CalendarPost]
+    days: list[CalendarDay]
+
+
+class CalendarFeedResponse(BaseModel):
+    """Calendar feed subscription info."""
+
+    url: str
+
+
+class CalendarDensityDay(BaseModel):
+    """Post counts of one day in the user's timezone."""
+
+    date: date
+    total: int
+    by_status: dict[str, int]
+    by_community: dict[UUID, int] | None = None
+
+
+class CalendarDensityResponse(BaseModel):
+    """Aggregated post counts per day for year/quarter overviews."""
+
+    year: int
+    quarter: int | None
+    timezone: str
+    days: list[CalendarDensityDay]
@@ -50,6 +50,7 @@ class PostResponse(PostBase):
     """Post response schema."""
 
     id: UUID
+    content_preview: str | None = None
     scheduled_at: datetime | None
     status: str
     error_message: str | None
@@ -65,3 +66,78 @@ class PostListResponse(BaseModel):
 
     data: list[PostResponse]
     pagination: dict
+
+
+class PostSearchResult(BaseModel):
+    """Post search hit."""
+
+    id: UUID
+    snippet: str  # Matched fragments as HTML: escaped text, terms wrapped in <mark>...</mark>
+    rank: float
+    status: str
+    scheduled_at: datetime | None
+    created_at: datetime
+
+
+class PostSearchResponse(BaseModel):
+    """Post search response schema."""
+
+    data: list[PostSearchResult]
+    next_cursor: str | None
+
+
+class PostStatusSummary(BaseModel):
+    """Post counts by status."""
+
+    counts: dict[str, int]  # Every post status, zero included
+    total: int
+
+
+class PostBatchCreate(BaseModel):
+    """Batch post creation schema (JSON body of POST /posts/batch)."""
+
+    posts: list[dict] = Field(min_length=1, description="Posts in PostCreate format")
+
+
+class PostBatchItemResult(BaseModel):
+    """Result of one item of a batch."""
+
+    index: int
+    status: str  # 'created', 'error' or 'skipped' (all_or_nothing)
+    id: UUID | None = None
+    error: str | None = None
+
+
+class PostBatchResponse(BaseModel):
+    """Batch post creation response schema."""
+
+    created: int
+    failed: int
+    results: list[PostBatchItemResult]
+
+
+class PostBulkFilter(BaseModel):
+    """Post selection filter for bulk operations."""
+
+    status: str | None = None
+    community_id: UUID | None = None
+    scheduled_from: datetime | None = None
+    scheduled_to: datetime | None = None
+
+
+class PostBulkOperation(BaseModel):
+    """Bulk operation request schema (select posts by ids and/or filter)."""
+
+    action: str = Field(description="reschedule, cancel, delete or retry_failed")
+    ids: list[UUID] | None = Field(default=None, min_length=1, max_length=5000)
+    filter: PostBulkFilter | None = None
+    offset_minutes: int | None = Field(default=None, description="Shift of scheduled_at for reschedule")
+
+
+class PostBulkResult(BaseModel):
+    """Bulk operation result schema."""
+
+    action: str
+    affected: int
+    ids: list[UUID]
+    skipped_ids: list[UUID] | None = None
@@ -0,0 +1,128 @@
+"""Columnar (Parquet / Arrow IPC) export of analytics snapshots."""
+
+import io
+from collections.abc import AsyncIterator
+from datetime import datetime
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Float, Select, cast, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.analytics import AnalyticsSnapshot
+
+EXPORT_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+SNAPSHOT_SCHEMA = pa.schema(
+    [
+        ("community_id", pa.dictionary(pa.int32(), pa.string())),
+        ("metric_name", pa.dictionary(pa.int32(), pa.string())),
+        ("recorded_at", pa.timestamp("us", tz="UTC")),
+        ("metric_value", pa.float64()),
+    ]
+)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands over whatever the writer produced since the last drain."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def snapshots_export_query(
+    community_ids: list[UUID],
+    metrics: list[str] | None,
+    date_from: datetime,
+    date_to: datetime,
+) -> Select:
+    """Snapshot tuples in index order (community, metric, time)."""
+    query = select(
+        AnalyticsSnapshot.community_id,
+        AnalyticsSnapshot.metric_name,
+        AnalyticsSnapshot.recorded_at,
+        cast(AnalyticsSnapshot.metric_value, Float).label("metric_value"),
+    ).where(
+        AnalyticsSnapshot.community_id.in_(community_ids),
+        AnalyticsSnapshot.recorded_at >= date_from,
+        AnalyticsSnapshot.recorded_at <= date_to,
+    )
+    if metrics:
+        query = query.where(AnalyticsSnapshot.metric_name.in_(metrics))
+    return query.order_by(
+        AnalyticsSnapshot.community_id,
+        AnalyticsSnapshot.metric_name,
+        AnalyticsSnapshot.recorded_at,
+    )
+
+
+def _record_batch(rows: list) -> pa.RecordBatch:
+    """Transpose a fetched partition into a record batch."""
+    community_ids, metric_names, recorded_at, values = zip(*rows, strict=True)
+    return pa.record_batch(
+        [
+            pa.array([str(community_id) for community_id in community_ids]).dictionary_encode(),
+            pa.array(metric_names, pa.string()).dictionary_encode(),
+            pa.array(recorded_at, pa.timestamp("us", tz="UTC")),
+            pa.array(values, pa.float64()),
+        ],
+        schema=SNAPSHOT_SCHEMA,
+    )
+
+
+async def stream_snapshots(
+    session_factory: async_sessionmaker[AsyncSession],
+    query: Select,
+    export_format: str,
+    batch_size: int | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Encode snapshots as Parquet or an Arrow IPC stream while they are fetched.
+
+    Every partition of the server-side cursor becomes one record batch (one Parquet
+    row group), and the bytes it produced are yielded before the next fetch, so
+    memory is bounded by the batch size.
+    """
+    batch_size = batch_size or settings.analytics_export_batch_size
+    sink = _ChunkSink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(sink, SNAPSHOT_SCHEMA, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(
+            sink, SNAPSHOT_SCHEMA, options=pa.ipc.IpcWriteOptions(compression="zstd")
+        )
+
+    try:
+        async with session_factory() as session:
+            result = await session.stream(query.execution_options(yield_per=batch_size))
+            async for partition in result.partitions(batch_size):
+                writer.write_batch(_record_batch(partition))
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,366 @@
+"""Weekly analytics digest emails."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.mime.multipart import MIMEMultipart
+from html import escape
+from pathlib import Path
+from string import Template
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.core.email import SMTPConnectionPool, build_message
+from app.models.analytics import AnalyticsSnapshot
+from app.models.community import Community
+from app.models.post import Post, PostPublication
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SUBJECT = "Еженедельный отчёт - Public Boost"
+
+# Templates are parsed once at import time and only substituted per user
+_HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"></head>
+<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+    <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+        <h1>Итоги недели</h1>
+        <p>$period</p>
+        <p>Подписчиков всего: <strong>$total_followers</strong> ($total_growth за неделю)</p>
+        <p>Опубликовано постов: <strong>$published_posts</strong>,
+           запланировано на следующую неделю: <strong>$upcoming_posts</strong></p>
+        <table style="width: 100%; border-collapse: collapse;">
+            <tr><th align="left">Сообщество</th><th>Подписчики</th><th>Прирост</th><th>Вовлечённость</th></tr>
+$rows
+        </table>
+        <p><a href="$dashboard_url">Открыть дашборд</a></p>
+        <div style="margin-top: 30px; font-size: 12px; color: #666;">
+            <p>С уважением,<br>Команда Public Boost</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+_HTML_ROW_TEMPLATE = Template(
+    "            <tr><td>$name ($platform)</td><td align=\"center\">$followers</td>"
+    "<td align=\"center\">$growth</td><td align=\"center\">$engagement%</td></tr>"
+)
+
+_TEXT_TEMPLATE = Template("""Итоги недели - Public Boost
+$period
+
+Подписчиков всего: $total_followers ($total_growth за неделю)
+Опубликовано постов: $published_posts
+Запланировано на следующую неделю: $upcoming_posts
+
+$rows
+
+Дашборд: $dashboard_url
+
+С уважением,
+Команда Public Boost
+""")
+
+_TEXT_ROW_TEMPLATE = Template("- $name ($platform): $followers подписчиков, $growth, вовлечённость $engagement%")
+
+
+@dataclass
+class CommunityDigest:
+    """Weekly metrics of a single community."""
+
+    name: str
+    platform: str
+    followers: int = 0
+    growth: int = 0
+    engagement_rate: float = 0.0
+
+
+@dataclass
+class UserDigest:
+    """Weekly digest data of a single user."""
+
+    user_id: UUID
+    email: str
+    communities: list[CommunityDigest] = field(default_factory=list)
+    published_posts: int = 0
+    upcoming_posts: int = 0
+
+
+@dataclass
+class DigestStats:
+    """Digest run statistics."""
+
+    users_scanned: int = 0
+    emails_sent: int = 0
+    emails_failed: int = 0
+
+
+class RateLimiter:
+    """Spaces out calls to at most `rate` per second across all callers."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait for the next free slot."""
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _signed(value: int) -> str:
+    """Format a growth value with an explicit sign."""
+    return f"+{value}" if value > 0 else str(value)
+
+
+async def load_chunk_digests(
+    conn: AsyncConnection,
+    users: list,
+    week_start: datetime,
+    week_end: datetime,
+) -> list[UserDigest]:
+    """
+    Compute digests for a chunk of users with a fixed number of set-based queries.
+
+    Latest metric values and the follower count at the start of the week are fetched
+    with DISTINCT ON over idx_analytics_snapshots_metric for all communities of the
+    chunk at once, post counters are aggregated with GROUP BY user_id. Growth of a
+    community without snapshots before the week is counted from its first snapshot
+    in the week; without any follower snapshot it stays 0.
+    """
+    digests = {row.id: UserDigest(user_id=row.id, email=row.email) for row in users}
+    user_ids = list(digests)
+
+    communities_result = await conn.execute(
+        select(Community.id, Community.user_id, Community.name, Community.platform)
+        .where(
+            Community.user_id.in_(user_ids),
+            Community.deleted_at.is_(None),
+            Community.is_active == True,
+        )
+        .order_by(Community.user_id, Community.name)
+    )
+    communities: dict[UUID, CommunityDigest] = {}
+    for row in communities_result:
+        community = CommunityDigest(name=row.name, platform=row.platform)
+        communities[row.id] = community
+        digests[row.user_id].communities.append(community)
+
+    if communities:
+        community_ids = list(communities)
+        latest_result = await conn.execute(
+            select(AnalyticsSnapshot.community_id, AnalyticsSnapshot.metric_name, AnalyticsSnapshot.metric_value)
+            .where(
+                AnalyticsSnapshot.community_id.in_(community_ids),
+                AnalyticsSnapshot.metric_name.in_(["follower_count", "engagement_rate"]),
+                AnalyticsSnapshot.recorded_at <= week_end,
+            )
+            .distinct(AnalyticsSnapshot.community_id, AnalyticsSnapshot.metric_name)
+            .order_by(
+                AnalyticsSnapshot.community_id,
+                AnalyticsSnapshot.metric_name,
+                AnalyticsSnapshot.recorded_at.desc(),
+            )
+        )
+        for row in latest_result:
+            community = communities[row.community_id]
+            if row.metric_name == "follower_count":
+                community.followers = int(row.metric_value)
+            else:
+                community.engagement_rate = round(float(row.metric_value), 2)
+
+        previous_result = await conn.execute(
+            select(AnalyticsSnapshot.community_id, AnalyticsSnapshot.metric_value)
+            .where(
+                AnalyticsSnapshot.community_id.in_(community_ids),
+                AnalyticsSnapshot.metric_name == "follower_count",
+                AnalyticsSnapshot.recorded_at < week_start,
+            )
+            .distinct(AnalyticsSnapshot.community_id)
+            .order_by(AnalyticsSnapshot.community_id, AnalyticsSnapshot.recorded_at.desc())
+        )
+        baselines = {row.community_id: int(row.metric_value) for row in previous_result}
+
+        # Communities first measured during the week grow from their first snapshot
+        new_community_ids = [community_id for community_id in community_ids if community_id not in baselines]
+        if new_community_ids:
+            first_result = await conn.execute(
+                select(AnalyticsSnapshot.community_id, AnalyticsSnapshot.metric_value)
+                .where(
+                    AnalyticsSnapshot.community_id.in_(new_community_ids),
+                    AnalyticsSnapshot.metric_name == "follower_count",
+                    AnalyticsSnapshot.recorded_at >= week_start,
+                    AnalyticsSnapshot.recorded_at <= week_end,
+                )
+                .distinct(AnalyticsSnapshot.community_id)
+                .order_by(AnalyticsSnapshot.community_id, AnalyticsSnapshot.recorded_at)
+            )
+            baselines.update((row.community_id, int(row.metric_value)) for row in first_result)
+
+        for community_id, baseline in baselines.items():
+            community = communities[community_id]
+            community.growth = community.followers - baseline
+
+    published_result = await conn.execute(
+        select(Post.user_id, func.count(func.distinct(Post.id)))
+        .join(PostPublication, PostPublication.post_id == Post.id)
+        .where(
+            Post.user_id.in_(user_ids),
+            PostPublication.status == "published",
+            PostPublication.published_at >= week_start,
+            PostPublication.published_at < week_end,
+        )
+        .group_by(Post.user_id)
+    )
+    for user_id, count in published_result:
+        digests[user_id].published_posts = count
+
+    upcoming_result = await conn.execute(
+        select(Post.user_id, func.count())
+        .where(
+            Post.user_id.in_(user_ids),
+            Post.status == "scheduled",
+            Post.scheduled_at >= week_end,
+            Post.scheduled_at < week_end + timedelta(days=7),
+        )
+        .group_by(Post.user_id)
+    )
+    for user_id, count in upcoming_result:
+        digests[user_id].upcoming_posts = count
+
+    return [digest for digest in digests.values() if digest.communities]
+
+
+def render_digest(digest: UserDigest, week_start: datetime, week_end: datetime) -> MIMEMultipart:
+    """Render a digest email from the precompiled templates."""
+    period = f"{week_start:%d.%m.%Y} - {(week_end - timedelta(days=1)):%d.%m.%Y}"
+    values = {
+        "period": period,
+        "total_followers": sum(c.followers for c in digest.communities),
+        "total_growth": _signed(sum(c.growth for c in digest.communities)),
+        "published_posts": digest.published_posts,
+        "upcoming_posts": digest.upcoming_posts,
+        "dashboard_url": f"{settings.frontend_url}/dashboard",
+    }
+    rows = [
+        {
+            "name": c.name,
+            "platform": c.platform,
+            "followers": c.followers,
+            "growth": _signed(c.growth),
+            "engagement": c.engagement_rate,
+        }
+        for c in digest.communities
+    ]
+
+    html_body = _HTML_TEMPLATE.substitute(
+        values,
+        dashboard_url=escape(values["dashboard_url"]),
+        rows="\n".join(
+            _HTML_ROW_TEMPLATE.substitute(row, name=escape(row["name"])) for row in rows
+        ),
+    )
+    text_body = _TEXT_TEMPLATE.substitute(
+        values,
+        rows="\n".join(_TEXT_ROW_TEMPLATE.substitute(row) for row in rows),
+    )
+    return build_message(digest.email, DIGEST_SUBJECT, html_body, text_body)
+
+
+async def send_weekly_digests(
+    engine: AsyncEngine,
+    week_end: datetime | None = None,
+    dry_run: bool = False,
+    output_dir: Path | None = None,
+    chunk_size: int | None = None,
+    rate_per_second: float | None = None,
+) -> DigestStats:
+    """
+    Build and send the weekly digest to every active user with communities.
+
+    Users are streamed through a server-side cursor, metrics are computed per chunk of
+    users (see load_chunk_digests) and rendered emails are delivered by one sender per
+    pooled SMTP connection, throttled to rate_per_second overall. In dry-run mode the
+    emails are written to output_dir as .eml files instead.
+
+    Args:
+        engine: Database engine
+        week_end: End of the reported week (exclusive), defaults to today 00:00 UTC
+        dry_run: Write .eml files instead of sending
+        output_dir: Directory for .eml files (defaults to settings.digest_output_dir)
+        chunk_size: Users per chunk
+        rate_per_second: Maximum emails per second
+
+    Returns:
+        Run statistics
+    """
+    if week_end is None:
+        week_end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = week_end - timedelta(days=7)
+    chunk_size = chunk_size or settings.digest_chunk_size
+    rate_per_second = rate_per_second or settings.digest_rate_per_second
+    output_dir = output_dir or Path(settings.digest_output_dir)
+
+    stats = DigestStats()
+    pool = SMTPConnectionPool()
+    limiter = RateLimiter(rate_per_second)
+    # Bounded so rendering never runs far ahead of delivery
+    outbox: asyncio.Queue[MIMEMultipart | None] = asyncio.Queue(maxsize=chunk_size)
+
+    if dry_run:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    async def deliver(message: MIMEMultipart) -> None:
+        if dry_run:
+            path = output_dir / f"{message['To']}.eml"
+            path.write_bytes(message.as_bytes())
+            return
+        await limiter.wait()
+        async with pool.connection() as smtp:
+            await smtp.send_message(message)
+
+    async def sender() -> None:
+        while (message := await outbox.get()) is not None:
+            try:
+                await deliver(message)
+                stats.emails_sent += 1
+            except Exception as e:
+                stats.emails_failed += 1
+                logger.error(f"[DIGEST] Error sending digest to {message['To']}: {e}")
+
+    senders = [asyncio.create_task(sender()) for _ in range(1 if dry_run else pool.size)]
+    try:
+        async with engine.connect() as read_conn, engine.connect() as metrics_conn:
+            result = await read_conn.stream(
+                select(User.id, User.email)
+                .where(User.is_active == True)
+                .order_by(User.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            async for users in result.partitions(chunk_size):
+                stats.users_scanned += len(users)
+                for digest in await load_chunk_digests(metrics_conn, users, week_start, week_end):
+                    await outbox.put(render_digest(digest, week_start, week_end))
+                # Do not keep a snapshot open on the metrics connection between chunks
+                await metrics_conn.rollback()
+                logger.info(f"[DIGEST] Processed {stats.users_scanned} users, sent {stats.emails_sent}")
+    finally:
+        for _ in senders:
+            await outbox.put(None)
+        await asyncio.gather(*senders, return_exceptions=True)
+        await pool.close()
+
+    return stats
@@ -0,0 +1,187 @@
+"""Online re-encryption of stored community tokens after an encryption key rotation."""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from uuid import UUID
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy import Text, Uuid, column, func, select, text, update, values
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.security import is_encrypted_with_current_key, rotate_token
+from app.models.community import Community
+
+logger = logging.getLogger(__name__)
+
+TOKEN_COLUMNS = ("access_token_encrypted", "refresh_token_encrypted", "bot_token_encrypted")
+
+
+@dataclass
+class RotationProgress:
+    """Progress of a key rotation run, persisted as the resume checkpoint."""
+
+    last_id: str | None = None
+    total: int = 0
+    scanned: int = 0
+    rotated: int = 0
+    skipped: int = 0
+    conflicts: int = 0
+    failed: int = 0
+
+    @property
+    def percent(self) -> float:
+        """Share of scanned communities, in percent."""
+        return round(self.scanned / self.total * 100, 1) if self.total else 100.0
+
+
+def load_checkpoint(path: Path) -> RotationProgress:
+    """Load rotation progress from a checkpoint file, or start from scratch."""
+    if not path.exists():
+        return RotationProgress()
+    return RotationProgress(**json.loads(path.read_text(encoding="utf-8")))
+
+
+def save_checkpoint(path: Path, progress: RotationProgress) -> None:
+    """Atomically persist rotation progress."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(asdict(progress)), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _rotate_row(row) -> tuple | None:
+    """
+    Build (id, old tokens..., new tokens...), or None if every token is already current.
+
+    Raises InvalidToken if no configured key decrypts one of the tokens.
+    """
+    old_values = tuple(getattr(row, column) for column in TOKEN_COLUMNS)
+    new_values = tuple(
+        rotate_token(value) if value and not is_encrypted_with_current_key(value) else value
+        for value in old_values
+    )
+    if new_values == old_values:
+        return None
+    return (row.id, *old_values, *new_values)
+
+
+def _build_update(rows: list[tuple]):
+    """
+    Build a single UPDATE ... FROM (VALUES ...) statement for a batch.
+
+    Compare-and-set on the old ciphertexts so a token written concurrently by the API
+    (already encrypted with the current key) is never overwritten with a stale value.
+    updated_at is kept as is: rotation does not change anything visible to clients.
+    """
+    communities = Community.__table__
+    batch = values(
+        column("id", Uuid),
+        *(column(f"old_{name}", Text) for name in TOKEN_COLUMNS),
+        *(column(f"new_{name}", Text) for name in TOKEN_COLUMNS),
+        name="batch",
+    ).data(rows)
+
+    return (
+        update(communities)
+        .where(
+            communities.c.id == batch.c.id,
+            *(communities.c[name].is_not_distinct_from(batch.c[f"old_{name}"]) for name in TOKEN_COLUMNS),
+        )
+        .values(
+            updated_at=communities.c.updated_at,
+            **{name: batch.c[f"new_{name}"] for name in TOKEN_COLUMNS},
+        )
+        .returning(communities.c.id)
+    )
+
+
+async def rotate_encryption_keys(
+    engine: AsyncEngine,
+    checkpoint_path: Path | None = None,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+    on_progress: Callable[[RotationProgress], None] | None = None,
+) -> RotationProgress:
+    """
+    Re-encrypt all community tokens with the current encryption key.
+
+    Communities are streamed in primary key order through a server-side cursor on a
+    dedicated read connection. Updates are written on a separate connection and
+    committed in small batches, each with a short lock_timeout, so the job never
+    holds row locks for long and yields to API traffic. After every batch the last
+    processed id is checkpointed, so an interrupted run resumes where it stopped.
+    Communities whose tokens no configured key can decrypt are logged, counted as
+    failed and left unchanged.
+
+    Args:
+        engine: Database engine
+        checkpoint_path: Checkpoint file (defaults to settings.key_rotation_checkpoint_file)
+        batch_size: Rows per committed batch
+        pause_seconds: Pause between batches to throttle database load
+        on_progress: Callback invoked after each batch
+
+    Returns:
+        Final rotation progress
+    """
+    checkpoint_path = checkpoint_path or Path(settings.key_rotation_checkpoint_file)
+    batch_size = batch_size or settings.key_rotation_batch_size
+    pause_seconds = settings.key_rotation_pause_seconds if pause_seconds is None else pause_seconds
+
+    progress = load_checkpoint(checkpoint_path)
+    last_id = UUID(progress.last_id) if progress.last_id else None
+
+    query = select(Community.id, *(getattr(Community, column) for column in TOKEN_COLUMNS))
+    if last_id is not None:
+        query = query.where(Community.id > last_id)
+    query = query.order_by(Community.id)
+
+    async with engine.connect() as read_conn, engine.connect() as write_conn:
+        progress.total = (await read_conn.execute(select(func.count()).select_from(Community))).scalar_one()
+
+        result = await read_conn.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions(batch_size):
+            updates = []
+            failed = 0
+            for row in rows:
+                try:
+                    params = _rotate_row(row)
+                except InvalidToken:
+                    # Undecryptable with every configured key: leave the row as is
+                    logger.error(f"[KEY ROTATION] Community {row.id}: no configured key decrypts its tokens")
+                    failed += 1
+                    continue
+                if params is not None:
+                    updates.append(params)
+
+            if updates:
+                async with write_conn.begin():
+                    await write_conn.execute(
+                        text(f"SET LOCAL lock_timeout = {int(settings.key_rotation_lock_timeout_ms)}")
+                    )
+                    update_result = await write_conn.execute(_build_update(updates))
+                rotated = len(update_result.all())
+                progress.rotated += rotated
+                progress.conflicts += len(updates) - rotated
+
+            progress.scanned += len(rows)
+            progress.skipped += len(rows) - len(updates) - failed
+            progress.failed += failed
+            progress.last_id = str(rows[-1].id)
+            save_checkpoint(checkpoint_path, progress)
+
+            logger.info(
+                f"[KEY ROTATION] {progress.scanned}/{progress.total} ({progress.percent}%) "
+                f"rotated={progress.rotated} skipped={progress.skipped} conflicts={progress.conflicts} "
+                f"failed={progress.failed}"
+            )
+            if on_progress:
+                on_progress(progress)
+
+            if pause_seconds > 0:
+                await asyncio.sleep(pause_seconds)
+
+    return progress
@@ -0,0 +1,147 @@
+"""Per-user post status counters (user_post_counters).
+
+Every write that creates, deletes or changes the status of posts passes its
+transitions to adjust_post_counters() before committing, so the counters change
+in the same transaction as the posts. reconcile_post_counters() recounts the
+posts table and repairs any drift (e.g. from writers outside the API).
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.models.post import Post, UserPostCounter
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def status_deltas(transitions: Iterable[tuple[str | None, str | None]]) -> Counter:
+    """Per-status count changes of (old_status, new_status) pairs; None means created/deleted."""
+    deltas: Counter = Counter()
+    for old_status, new_status in transitions:
+        if old_status == new_status:
+            continue
+        if old_status is not None:
+            deltas[old_status] -= 1
+        if new_status is not None:
+            deltas[new_status] += 1
+    return deltas
+
+
+async def adjust_post_counters(
+    db: AsyncSession,
+    user_id: UUID,
+    transitions: Iterable[tuple[str | None, str | None]],
+) -> None:
+    """
+    Apply status transitions of a user's posts to their counters.
+
+    One INSERT ... ON CONFLICT DO UPDATE SET count = count + delta in the caller's
+    transaction. Rows are written in status order so concurrent writers of the
+    same user lock them in the same order.
+    """
+    deltas = {status: delta for status, delta in status_deltas(transitions).items() if delta}
+    if not deltas:
+        return
+
+    statement = pg_insert(UserPostCounter).values(
+        [{"user_id": user_id, "status": status, "count": deltas[status]} for status in sorted(deltas)]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[UserPostCounter.user_id, UserPostCounter.status],
+        set_={
+            "count": UserPostCounter.count + statement.excluded.count,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(statement)
+
+
+async def get_post_counters(db: AsyncSession, user_id: UUID) -> dict[str, int]:
+    """Stored counters of a user, by status."""
+    result = await db.execute(
+        select(UserPostCounter.status, UserPostCounter.count).where(UserPostCounter.user_id == user_id)
+    )
+    return dict(result.all())
+
+
+async def _reconcile_users(db: AsyncSession, user_ids: list[UUID]) -> int:
+    """Recount the posts of the given users and fix their counters, returns the number of fixed rows."""
+    # Lock the counters first: writers that already adjusted them have committed by
+    # the time the recount below starts, later writers wait and apply on top of it.
+    stored_result = await db.execute(
+        select(UserPostCounter.user_id, UserPostCounter.status, UserPostCounter.count)
+        .where(UserPostCounter.user_id.in_(user_ids))
+        .order_by(UserPostCounter.user_id, UserPostCounter.status)
+        .with_for_update()
+    )
+    stored = {(user_id, status): count for user_id, status, count in stored_result.all()}
+
+    actual_result = await db.execute(
+        select(Post.user_id, Post.status, func.count())
+        .where(Post.user_id.in_(user_ids))
+        .group_by(Post.user_id, Post.status)
+    )
+    actual = {(user_id, status): count for user_id, status, count in actual_result.all()}
+
+    fixes = [
+        {"user_id": user_id, "status": status, "count": actual.get((user_id, status), 0)}
+        for user_id, status in sorted(stored.keys() | actual.keys())
+        if stored.get((user_id, status), 0) != actual.get((user_id, status), 0)
+    ]
+    if fixes:
+        for fix in fixes:
+            logger.warning(
+                "Post counter drift: user=%s status=%s stored=%s actual=%s",
+                fix["user_id"],
+                fix["status"],
+                stored.get((fix["user_id"], fix["status"])),
+                fix["count"],
+            )
+        statement = pg_insert(UserPostCounter).values(fixes)
+        statement = statement.on_conflict_do_update(
+            index_elements=[UserPostCounter.user_id, UserPostCounter.status],
+            set_={"count": statement.excluded.count, "updated_at": func.now()},
+        )
+        await db.execute(statement)
+    return len(fixes)
+
+
+async def reconcile_post_counters(
+    engine: AsyncEngine,
+    batch_size: int | None = None,
+    pause_seconds: float = 0.0,
+) -> tuple[int, int]:
+    """
+    Compare every user's counters with the posts table, in user id batches.
+
+    Returns (users checked, counter rows fixed).
+    """
+    batch_size = batch_size or settings.post_counters_reconcile_batch_size
+
+    checked = fixed = 0
+    last_id: UUID | None = None
+    while True:
+        async with AsyncSession(engine) as db:
+            query = select(User.id).order_by(User.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(User.id > last_id)
+            user_ids = list((await db.execute(query)).scalars().all())
+            if not user_ids:
+                return checked, fixed
+
+            fixed += await _reconcile_users(db, user_ids)
+            await db.commit()
+
+        checked += len(user_ids)
+        last_id = user_ids[-1]
+        if pause_seconds:
+            await asyncio.sleep(pause_seconds)
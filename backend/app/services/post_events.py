@@ -0,0 +1,72 @@
+"""Side effects of post changes.
+
+Post endpoints call these after committing, so derived data (caches) never lags
+behind the posts table and live event streams only report committed changes.
+"""
+
+from collections.abc import Iterable
+from uuid import UUID
+
+from app.core.cache import cache_delete, cache_incr
+from app.core.config import settings
+from app.core.events import publish_user_events
+
+
+def calendar_density_cache_key(user_id: UUID) -> str:
+    """Redis hash holding a user's cached calendar density responses."""
+    return f"calendar_density:{user_id}"
+
+
+def calendar_density_generation_key(user_id: UUID) -> str:
+    """Counter bumped on every change of a user's posts; part of the density cache fields."""
+    return f"calendar_density_generation:{user_id}"
+
+
+async def _invalidate_calendar_density(user_id: UUID) -> None:
+    # Bump the generation first: a request that read the old one before this change
+    # may still store its result, but under a field nobody looks up any more
+    await cache_incr(calendar_density_generation_key(user_id), settings.calendar_density_cache_ttl_seconds * 2)
+    await cache_delete(calendar_density_cache_key(user_id))
+
+
+async def posts_changed(user_id: UUID, statuses: Iterable[tuple[UUID, str]] = ()) -> None:
+    """
+    Invalidate everything derived from a user's posts and publications.
+
+    statuses are (post_id, new status) pairs of posts whose status changed ("deleted"
+    for removed posts); they are pushed to the user's live event streams.
+    """
+    await _invalidate_calendar_density(user_id)
+    await publish_user_events(
+        user_id,
+        (("post.status", {"post_id": str(post_id), "status": status}) for post_id, status in statuses),
+    )
+
+
+async def publication_status_changed(
+    user_id: UUID,
+    post_id: UUID,
+    post_status: str,
+    publication_id: UUID,
+    community_id: UUID,
+    publication_status: str,
+    error_message: str | None = None,
+) -> None:
+    """Publish the outcome of one publication attempt (called by publication workers after commit)."""
+    await _invalidate_calendar_density(user_id)
+    await publish_user_events(
+        user_id,
+        [
+            (
+                "publication.status",
+                {
+                    "post_id": str(post_id),
+                    "publication_id": str(publication_id),
+                    "community_id": str(community_id),
+                    "status": publication_status,
+                    "error_message": error_message,
+                },
+            ),
+            ("post.status", {"post_id": str(post_id), "status": post_status}),
+        ],
+    )
@@ -0,0 +1,143 @@
+"""Post read model: one ready-to-serve JSONB document per post.
+
+Every write that changes a post, its publications or the name of a target
+community calls refresh_post_documents() before committing, so the documents
+change in the same transaction as the source rows. The document has the shape of
+PostResponse (plus content_preview) and is built entirely in SQL.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import Select, Text, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.models.community import Community
+from app.models.post import Post, PostPublication, PostReadModel
+
+logger = logging.getLogger(__name__)
+
+READ_MODEL_COLUMNS = ["post_id", "user_id", "status", "scheduled_at", "created_at", "document", "refreshed_at"]
+
+
+def _publications_document():
+    """Correlated subquery: JSONB array of a post's publications, ordered by community name."""
+    publication = func.jsonb_build_object(
+        "id", PostPublication.id,
+        "community_id", PostPublication.community_id,
+        "community_name", Community.name,
+        "platform", Community.platform,
+        "status", PostPublication.status,
+        "external_post_id", PostPublication.external_post_id,
+        "published_at", PostPublication.published_at,
+        "error_message", PostPublication.error_message,
+    )
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(publication, Community.name)),
+                literal_column("'[]'::jsonb"),
+            )
+        )
+        .select_from(PostPublication)
+        .join(Community, Community.id == PostPublication.community_id)
+        .where(PostPublication.post_id == Post.id)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+
+
+def post_documents_query(*conditions) -> Select:
+    """Read model rows for the posts matching the conditions."""
+    document = func.jsonb_build_object(
+        "id", Post.id,
+        "content_text", Post.content_text,
+        "content_preview", Post.content_preview,
+        "image_url", Post.image_url,
+        "scheduled_at", Post.scheduled_at,
+        "status", Post.status,
+        "error_message", Post.error_message,
+        "created_at", Post.created_at,
+        "updated_at", Post.updated_at,
+        "publications", _publications_document(),
+    )
+    return select(
+        Post.id,
+        Post.user_id,
+        Post.status,
+        Post.scheduled_at,
+        Post.created_at,
+        document,
+        func.now(),
+    ).where(*conditions)
+
+
+async def refresh_post_documents(
+    db: AsyncSession,
+    post_ids: Iterable[UUID] | None = None,
+    community_id: UUID | None = None,
+) -> None:
+    """
+    Recompute the documents of the given posts, or of all posts targeting a community.
+
+    Runs as one INSERT ... SELECT ... ON CONFLICT DO UPDATE in the caller's transaction;
+    pending ORM changes are flushed first. Deleted posts drop their row by cascade.
+    """
+    if post_ids is not None:
+        post_ids = list(post_ids)
+        if not post_ids:
+            return
+        condition = Post.id.in_(post_ids)
+    elif community_id is not None:
+        condition = Post.id.in_(
+            select(PostPublication.post_id).where(PostPublication.community_id == community_id)
+        )
+    else:
+        raise ValueError("post_ids or community_id is required")
+
+    await db.flush()
+    statement = pg_insert(PostReadModel).from_select(READ_MODEL_COLUMNS, post_documents_query(condition))
+    statement = statement.on_conflict_do_update(
+        index_elements=[PostReadModel.post_id],
+        set_={name: statement.excluded[name] for name in READ_MODEL_COLUMNS if name != "post_id"},
+    )
+    await db.execute(statement)
+
+
+def document_json():
+    """The stored document as JSON text, served without decoding."""
+    return cast(PostReadModel.document, Text).label("document")
+
+
+async def rebuild_post_read_model(
+    engine: AsyncEngine,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+) -> int:
+    """Regenerate every document in primary key batches, one transaction per batch."""
+    batch_size = batch_size or settings.post_read_model_batch_size
+    pause_seconds = settings.post_read_model_pause_seconds if pause_seconds is None else pause_seconds
+
+    rebuilt = 0
+    last_id: UUID | None = None
+    while True:
+        async with AsyncSession(engine) as db:
+            query = select(Post.id).order_by(Post.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(Post.id > last_id)
+            post_ids = list((await db.execute(query)).scalars().all())
+            if not post_ids:
+                return rebuilt
+
+            await refresh_post_documents(db, post_ids)
+            await db.commit()
+
+        rebuilt += len(post_ids)
+        last_id = post_ids[-1]
+        logger.info("Rebuilt %d post documents (last id %s)", rebuilt, last_id)
+        if pause_seconds:
+            await asyncio.sleep(pause_seconds)
@@ -0,0 +1,143 @@
+"""Time series helpers for analytics metrics (NumPy over column arrays).
+
+A series is a pair of aligned arrays: recorded_at (datetime64[us], UTC without
+a zone) and value (float64), sorted by time.
+"""
+
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import UUID
+
+import numpy as np
+import pyarrow as pa
+from sqlalchemy import Float, cast, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics import AnalyticsSnapshot
+
+# Relative change over the period (on the fitted line) that counts as a trend
+TREND_THRESHOLD_PERCENT = 1.0
+
+
+def epoch_seconds(recorded_at: np.ndarray) -> np.ndarray:
+    """datetime64 timestamps as float seconds since the epoch."""
+    return recorded_at.astype("datetime64[us]").astype(np.int64) / 1e6
+
+
+async def fetch_metric_series(
+    db: AsyncSession,
+    community_id: UUID,
+    date_from: datetime,
+    date_to: datetime,
+    metric: str | None = None,
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """
+    Series of a community's metrics in a period, by metric name.
+
+    Selects only (metric_name, recorded_at, metric_value) as plain rows, with the
+    value cast to float in SQL, and turns the columns into arrays in one pass:
+    no ORM objects, identity map entries or per-row Decimals are created.
+    """
+    query = select(
+        AnalyticsSnapshot.metric_name,
+        AnalyticsSnapshot.recorded_at,
+        cast(AnalyticsSnapshot.metric_value, Float),
+    ).where(
+        AnalyticsSnapshot.community_id == community_id,
+        AnalyticsSnapshot.recorded_at >= date_from,
+        AnalyticsSnapshot.recorded_at <= date_to,
+    )
+    if metric:
+        query = query.where(AnalyticsSnapshot.metric_name == metric)
+
+    result = await db.execute(query.order_by(AnalyticsSnapshot.metric_name, AnalyticsSnapshot.recorded_at))
+    return metric_series_from_rows(result.all())
+
+
+def metric_series_from_rows(
+    rows: Sequence[tuple[str, datetime, float]],
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """
+    Split (metric_name, recorded_at, value) rows ordered by metric and time into series.
+
+    Aware timestamps (timestamptz) are normalized to UTC and stored without a zone,
+    as datetime64 has none; naive ones are taken as UTC.
+    """
+    if not rows:
+        return {}
+
+    names, recorded_at, values = zip(*rows, strict=True)
+    names = np.array(names, dtype=object)
+    # Arrow converts datetime objects in C, several times faster than NumPy does
+    recorded_at = pa.array(recorded_at, pa.timestamp("us", tz="UTC")).to_numpy()
+    values = np.array(values, dtype=np.float64)
+
+    # Rows are ordered by metric: each series is a contiguous slice
+    starts = np.concatenate(([0], np.flatnonzero(names[1:] != names[:-1]) + 1))
+    ends = np.append(starts[1:], len(names))
+    return {names[start]: (recorded_at[start:end], values[start:end]) for start, end in zip(starts, ends, strict=True)}
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; the interior is split into
+    max_points - 2 buckets and from each the point forming the largest triangle
+    with the previously kept point and the average of the next bucket is kept.
+    Bucket averages are computed for all buckets at once; only the selection,
+    which depends on the previous choice, walks the buckets.
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # max_points - 2 buckets over the interior points [1, n - 1), each non-empty
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[: n - 1], edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y[: n - 1], edges[:-1]) / sizes
+    # The last bucket looks ahead to the (always kept) last point
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        bucket_x, bucket_y = x[start:end], y[start:end]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (x[a] - next_x[bucket]) * (bucket_y - y[a]) - (x[a] - bucket_x) * (next_y[bucket] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+
+def linear_trend(x: np.ndarray, y: np.ndarray) -> tuple[str, float]:
+    """
+    Trend and change percent of a series from its least-squares line.
+
+    The change is measured between the fitted values at the first and last
+    timestamps, so a single noisy endpoint does not decide the trend.
+    """
+    if len(x) < 2:
+        return "stable", 0.0
+
+    x_centered = x - x.mean()
+    y_mean = y.mean()
+    denominator = np.dot(x_centered, x_centered)
+    slope = np.dot(x_centered, y - y_mean) / denominator if denominator else 0.0
+    fitted_first = y_mean + slope * x_centered[0]
+    fitted_last = y_mean + slope * x_centered[-1]
+    change_percent = float((fitted_last - fitted_first) / abs(fitted_first) * 100) if fitted_first else 0.0
+
+    if change_percent > TREND_THRESHOLD_PERCENT:
+        trend = "up"
+    elif change_percent < -TREND_THRESHOLD_PERCENT:
+        trend = "down"
+    else:
+        trend = "stable"
+    return trend, change_percent
@@ -0,0 +1,57 @@
+"""Pytest helpers: per-test SQL query budgets.
+
+Enable with ``-p app.testing`` (already set in pyproject.toml), then either declare a
+budget for a whole test::
+
+    @pytest.mark.query_budget(4)
+    async def test_get_calendar(client): ...
+
+or wrap a part of a test::
+
+    async def test_get_posts(client, query_budget):
+        with query_budget(3):
+            await client.get("/api/v1/posts")
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+
+from app.core.query_stats import QueryStats, track_queries
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, allow_repeated: bool = False) -> Iterator[QueryStats]:
+    """Fail if the block executes more than max_queries statements or an N+1 pattern."""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        shapes = "\n".join(f"  {count}x {shape}" for shape, count in stats.shapes.most_common(10))
+        pytest.fail(f"Query budget exceeded: {stats.count} > {max_queries} statements\n{shapes}")
+    repeated = stats.repeated()
+    if repeated and not allow_repeated:
+        shape, count = repeated[0]
+        pytest.fail(f"N+1 query pattern: {count}x {shape}")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "query_budget(max_queries, allow_repeated=False): fail if the test exceeds the budget"
+    )
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager factory asserting a query budget."""
+    return assert_query_budget
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    """Apply @pytest.mark.query_budget to the test body (fixture setup is not counted)."""
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    with assert_query_budget(*marker.args, **marker.kwargs):
+        return (yield)
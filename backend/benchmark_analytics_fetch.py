@@ -0,0 +1,177 @@
+"""Benchmark latency and memory of loading a community's metric series.
+
+Compares the ORM path previously used by GET /analytics/communities/{id}
+(AnalyticsSnapshot entities, grouped in Python, arrays built from attributes)
+with the columnar path used now (fetch_metric_series: three columns as plain
+rows, converted to NumPy arrays per metric). Runs against an in-memory SQLite
+database (aiosqlite, from the dev dependencies); Numeric values come back as
+Decimal there as they do with asyncpg. SQLite timestamps carry no zone, so the
+response values of the columnar path are also checked against UTC-aware rows
+shaped like asyncpg's timestamptz results.
+
+Usage:
+    python benchmark_analytics_fetch.py [--points 50000] [--metrics 4] [--iterations 5]
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.analytics import metric_detail
+from app.models.analytics import AnalyticsSnapshot
+from app.schemas.analytics import MetricValue
+from app.services.timeseries import fetch_metric_series, metric_series_from_rows
+
+
+async def seed(engine, points: int, metrics: int) -> tuple:
+    """Create the snapshots table and fill it with one community's series."""
+    async with engine.begin() as conn:
+        await conn.run_sync(AnalyticsSnapshot.__table__.create)
+
+    community_id = uuid4()
+    date_to = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with engine.begin() as conn:
+        for m in range(metrics):
+            rows = [
+                {
+                    "id": uuid4(),
+                    "community_id": community_id,
+                    "metric_name": f"metric_{m}",
+                    "metric_value": round(1000 + i * 0.05 + 50 * math.sin(i / 300 + m), 2),
+                    "recorded_at": date_to - timedelta(minutes=points - i),
+                }
+                for i in range(points)
+            ]
+            await conn.execute(insert(AnalyticsSnapshot.__table__), rows)
+    return community_id, date_to - timedelta(minutes=points), date_to
+
+
+async def orm_path(db: AsyncSession, community_id, date_from, date_to) -> dict:
+    """Previous handler code: ORM entities grouped by metric."""
+    result = await db.execute(
+        select(AnalyticsSnapshot)
+        .where(
+            AnalyticsSnapshot.community_id == community_id,
+            AnalyticsSnapshot.recorded_at >= date_from,
+            AnalyticsSnapshot.recorded_at <= date_to,
+        )
+        .order_by(AnalyticsSnapshot.metric_name, AnalyticsSnapshot.recorded_at)
+    )
+    snapshots = result.scalars().all()
+
+    metrics_dict: dict[str, list[AnalyticsSnapshot]] = {}
+    for snapshot in snapshots:
+        metrics_dict.setdefault(snapshot.metric_name, []).append(snapshot)
+    return {
+        metric_name: (
+            np.array([snapshot.recorded_at for snapshot in metric_snapshots], dtype="datetime64[us]"),
+            np.array([snapshot.metric_value for snapshot in metric_snapshots], dtype=np.float64),
+        )
+        for metric_name, metric_snapshots in metrics_dict.items()
+    }
+
+
+async def columnar_path(db: AsyncSession, community_id, date_from, date_to) -> dict:
+    """Current handler code."""
+    return await fetch_metric_series(db, community_id, date_from, date_to)
+
+
+async def measure(name: str, func, session_factory, args: tuple, iterations: int) -> tuple[float, float]:
+    """Median wall time and peak traced memory of loading the series in a fresh session."""
+    timings = []
+    for _ in range(iterations):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await func(db, *args)
+            timings.append(time.perf_counter() - start)
+
+    async with session_factory() as db:
+        tracemalloc.start()
+        series = await func(db, *args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del series
+
+    latency_ms = float(np.median(timings)) * 1000
+    peak_mb = peak / 1024 / 1024
+    print(f"{name:<9} {latency_ms:9.1f} ms   peak {peak_mb:8.1f} MB")
+    return latency_ms, peak_mb
+
+
+def keeps_aware_values(points: int, metrics: int) -> bool:
+    """Columnar response values equal the (metric_name, timestamptz, numeric) rows they came from."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        (f"metric_{m}", start + timedelta(minutes=i, microseconds=i), Decimal(f"{1000 + i * 0.05:.2f}"))
+        for m in range(metrics)
+        for i in range(points)
+    ]
+    expected: dict[str, list[MetricValue]] = {}
+    for metric_name, recorded_at, value in rows:
+        expected.setdefault(metric_name, []).append(MetricValue(value=float(value), recorded_at=recorded_at))
+
+    series = metric_series_from_rows([(name, recorded_at, float(value)) for name, recorded_at, value in rows])
+    actual = {name: metric_detail(name, *arrays).values for name, arrays in series.items()}
+    return actual == expected and all(
+        value.recorded_at.utcoffset() == timedelta(0) for values in actual.values() for value in values
+    )
+
+
+def same_series(left: dict, right: dict) -> bool:
+    return left.keys() == right.keys() and all(
+        np.array_equal(left[name][0], right[name][0]) and np.allclose(left[name][1], right[name][1])
+        for name in left
+    )
+
+
+async def run(points: int, metrics: int, iterations: int) -> int:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    try:
+        args = await seed(engine, points, metrics)
+
+        async with session_factory() as db:
+            orm = await orm_path(db, *args)
+        async with session_factory() as db:
+            columnar = await columnar_path(db, *args)
+        if not same_series(orm, columnar):
+            print("[ERROR] Paths produce different series")
+            return 1
+        if not keeps_aware_values(min(points, 1000), metrics):
+            print("[ERROR] Columnar path changes timestamptz values")
+            return 1
+        del orm, columnar
+
+        print(f"{metrics} metrics x {points} points, median of {iterations} runs")
+        orm_ms, orm_mb = await measure("orm", orm_path, session_factory, args, iterations)
+        columnar_ms, columnar_mb = await measure("columnar", columnar_path, session_factory, args, iterations)
+        print(f"speedup   {orm_ms / columnar_ms:9.1f}x        memory {orm_mb / columnar_mb:8.1f}x less")
+        return 0
+    finally:
+        await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark analytics series loading")
+    parser.add_argument("--points", type=int, default=50000, help="Snapshots per metric")
+    parser.add_argument("--metrics", type=int, default=4, help="Metrics of the community")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs per path")
+    args = parser.parse_args()
+    return asyncio.run(run(args.points, args.metrics, args.iterations))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
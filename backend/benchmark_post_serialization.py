@@ -0,0 +1,139 @@
+"""Benchmark CPU cost of serializing a 100-post page with publications.
+
+Compares the validated path (dicts -> PostResponse.model_validate, then the
+response_model pass: dump, validate again, jsonable_encoder, json.dumps) with the
+trusted path (model_construct + cached TypeAdapter dump_json). No database is
+needed.
+
+GET /posts and GET /posts/{id} now return the JSON documents of the post read
+model as stored, so this no longer measures what those endpoints serve; the
+trusted path remains the one of the create and update responses. When the list
+endpoint still used it, a 100-post page went from 20.2 to 4.3 ms CPU/request.
+
+Usage:
+    python benchmark_post_serialization.py [--posts 100] [--publications 2] [--iterations 200]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.posts import _post_response
+from app.core.serialization import model_response
+from app.schemas.post import PostListResponse, PostResponse
+
+
+def build_rows(posts: int, publications: int) -> tuple[list, dict]:
+    """Post rows and publication dicts shaped like the database results."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    post_rows = []
+    publications_by_post = {}
+    for i in range(posts):
+        content_text = f"Пост номер {i}\n" + "Текст поста с описанием акции. " * 40
+        post = SimpleNamespace(
+            id=uuid4(),
+            content_text=content_text,
+            content_preview=content_text.split("\n", 1)[0][:200],
+            image_url=f"https://cdn.example.com/images/{i}.jpg",
+            scheduled_at=now + timedelta(hours=i),
+            status="scheduled",
+            error_message=None,
+            created_at=now,
+            updated_at=now,
+        )
+        post_rows.append(post)
+        publications_by_post[post.id] = [
+            {
+                "id": uuid4(),
+                "community_id": uuid4(),
+                "community_name": f"Сообщество {j}",
+                "platform": "vk" if j % 2 == 0 else "telegram",
+                "status": "pending",
+                "external_post_id": None,
+                "published_at": None,
+                "error_message": None,
+            }
+            for j in range(publications)
+        ]
+    return post_rows, publications_by_post
+
+
+PAGINATION = {"page": 1, "page_size": 100, "total": 1000, "total_pages": 10}
+
+list_adapter = TypeAdapter(PostListResponse)
+
+
+def validated_path(post_rows: list, publications_by_post: dict) -> bytes:
+    """Previous handler code plus FastAPI's response_model validation and encoding."""
+    data = []
+    for post in post_rows:
+        post_dict = {
+            "id": post.id,
+            "content_text": post.content_text,
+            "content_preview": post.content_preview,
+            "image_url": post.image_url,
+            "scheduled_at": post.scheduled_at,
+            "status": post.status,
+            "error_message": post.error_message,
+            "created_at": post.created_at,
+            "updated_at": post.updated_at,
+            "publications": [dict(publication) for publication in publications_by_post[post.id]],
+        }
+        data.append(PostResponse.model_validate(post_dict))
+    response = PostListResponse(data=data, pagination=PAGINATION)
+
+    content = list_adapter.validate_python(response.model_dump(by_alias=True))
+    encoded = jsonable_encoder(list_adapter.dump_python(content, by_alias=True))
+    return json.dumps(encoded, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def trusted_path(post_rows: list, publications_by_post: dict) -> bytes:
+    """Current handler code: construct without validation, dump through a cached adapter."""
+    response = PostListResponse.model_construct(
+        data=[_post_response(post, publications_by_post[post.id]) for post in post_rows],
+        pagination=PAGINATION,
+    )
+    return model_response(PostListResponse, response).body
+
+
+def measure(name: str, func, args: tuple, iterations: int) -> float:
+    func(*args)  # warm up caches
+    start = time.process_time()
+    for _ in range(iterations):
+        body = func(*args)
+    per_request_ms = (time.process_time() - start) / iterations * 1000
+    print(f"{name:<10} {per_request_ms:8.3f} ms CPU/request   {len(body):>8} bytes")
+    return per_request_ms
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark post list serialization")
+    parser.add_argument("--posts", type=int, default=100, help="Posts per page")
+    parser.add_argument("--publications", type=int, default=2, help="Publications per post")
+    parser.add_argument("--iterations", type=int, default=200, help="Requests to simulate")
+    args = parser.parse_args()
+
+    rows = build_rows(args.posts, args.publications)
+    if json.loads(validated_path(*rows)) != json.loads(trusted_path(*rows)):
+        print("[ERROR] Paths produce different JSON")
+        return 1
+
+    print(f"{args.posts} posts x {args.publications} publications, {args.iterations} iterations")
+    validated = measure("validated", validated_path, rows, args.iterations)
+    trusted = measure("trusted", trusted_path, rows, args.iterations)
+    print(f"speedup    {validated / trusted:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
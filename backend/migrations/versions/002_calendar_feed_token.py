@@ -0,0 +1,27 @@
+"""Add calendar feed token to users
+
+Revision ID: 002_calendar_feed_token
+Revises: 001_initial
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002_calendar_feed_token'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('calendar_feed_token', sa.String(length=64), nullable=True))
+    op.create_index('idx_users_calendar_feed_token', 'users', ['calendar_feed_token'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_users_calendar_feed_token', table_name='users')
+    op.drop_column('users', 'calendar_feed_token')
@@ -0,0 +1,45 @@
+"""Add full-text and trigram search over posts
+
+Revision ID: 003_post_search
+Revises: 002_calendar_feed_token
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '003_post_search'
+down_revision: Union[str, None] = '002_calendar_feed_token'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column(
+        'posts',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('russian'::regconfig, content_text)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index('idx_posts_search_vector', 'posts', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'idx_posts_content_trgm',
+        'posts',
+        ['content_text'],
+        postgresql_using='gin',
+        postgresql_ops={'content_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_posts_content_trgm', table_name='posts')
+    op.drop_index('idx_posts_search_vector', table_name='posts')
+    op.drop_column('posts', 'search_vector')
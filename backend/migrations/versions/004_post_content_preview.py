@@ -0,0 +1,33 @@
+"""Add stored content preview to posts
+
+Revision ID: 004_post_content_preview
+Revises: 003_post_search
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_post_content_preview'
+down_revision: Union[str, None] = '003_post_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'posts',
+        sa.Column(
+            'content_preview',
+            sa.String(length=200),
+            sa.Computed("left(split_part(content_text, E'\\n', 1), 200)", persisted=True),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'content_preview')
@@ -0,0 +1,77 @@
+"""Add post read model
+
+Revision ID: 005_post_read_model
+Revises: 004_post_content_preview
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '005_post_read_model'
+down_revision: Union[str, None] = '004_post_content_preview'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'post_read_model',
+        sa.Column('post_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('document', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_index('idx_post_read_model_user_created', 'post_read_model', ['user_id', 'created_at'])
+    op.create_index('idx_post_read_model_user_status', 'post_read_model', ['user_id', 'status'])
+    op.create_index('idx_post_read_model_user_scheduled', 'post_read_model', ['user_id', 'scheduled_at'], postgresql_where=sa.text('scheduled_at IS NOT NULL'))
+
+    # Initial fill; rebuild_post_read_model.py regenerates it in batches later on
+    op.execute("""
+        INSERT INTO post_read_model (post_id, user_id, status, scheduled_at, created_at, document, refreshed_at)
+        SELECT p.id, p.user_id, p.status, p.scheduled_at, p.created_at,
+               jsonb_build_object(
+                   'id', p.id,
+                   'content_text', p.content_text,
+                   'content_preview', p.content_preview,
+                   'image_url', p.image_url,
+                   'scheduled_at', p.scheduled_at,
+                   'status', p.status,
+                   'error_message', p.error_message,
+                   'created_at', p.created_at,
+                   'updated_at', p.updated_at,
+                   'publications', (
+                       SELECT coalesce(jsonb_agg(jsonb_build_object(
+                                  'id', pp.id,
+                                  'community_id', pp.community_id,
+                                  'community_name', c.name,
+                                  'platform', c.platform,
+                                  'status', pp.status,
+                                  'external_post_id', pp.external_post_id,
+                                  'published_at', pp.published_at,
+                                  'error_message', pp.error_message
+                              ) ORDER BY c.name), '[]'::jsonb)
+                       FROM post_publications pp
+                       JOIN communities c ON c.id = pp.community_id
+                       WHERE pp.post_id = p.id
+                   )
+               ),
+               now()
+        FROM posts p
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_post_read_model_user_scheduled', table_name='post_read_model')
+    op.drop_index('idx_post_read_model_user_status', table_name='post_read_model')
+    op.drop_index('idx_post_read_model_user_created', table_name='post_read_model')
+    op.drop_table('post_read_model')
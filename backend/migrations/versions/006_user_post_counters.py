@@ -0,0 +1,42 @@
+"""Add per-user post status counters
+
+Revision ID: 006_user_post_counters
+Revises: 005_post_read_model
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '006_user_post_counters'
+down_revision: Union[str, None] = '005_post_read_model'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_post_counters',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'status')
+    )
+
+    # Initial counts; reconcile_post_counters.py keeps checking them later on
+    op.execute("""
+        INSERT INTO user_post_counters (user_id, status, count)
+        SELECT user_id, status, count(*)
+        FROM posts
+        GROUP BY user_id, status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('user_post_counters')
@@ -0,0 +1,55 @@
+"""Add a per-community analytics snapshot sequence
+
+Revision ID: 007_community_snapshot_sequence
+Revises: 006_user_post_counters
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_community_snapshot_sequence'
+down_revision: Union[str, None] = '006_user_post_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'communities',
+        sa.Column('snapshot_sequence', sa.BigInteger(), server_default='0', nullable=False),
+    )
+
+    # Bumped once per statement that writes or removes a community's snapshots, whichever
+    # process runs it (ingest workers, backfills, retention cleanup)
+    op.execute("""
+        CREATE FUNCTION bump_community_snapshot_sequence() RETURNS trigger AS $$
+        BEGIN
+            UPDATE communities SET snapshot_sequence = snapshot_sequence + 1
+            WHERE id IN (SELECT community_id FROM changed_snapshots);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER analytics_snapshots_inserted
+        AFTER INSERT ON analytics_snapshots
+        REFERENCING NEW TABLE AS changed_snapshots
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_community_snapshot_sequence()
+    """)
+    op.execute("""
+        CREATE TRIGGER analytics_snapshots_deleted
+        AFTER DELETE ON analytics_snapshots
+        REFERENCING OLD TABLE AS changed_snapshots
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_community_snapshot_sequence()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER analytics_snapshots_deleted ON analytics_snapshots")
+    op.execute("DROP TRIGGER analytics_snapshots_inserted ON analytics_snapshots")
+    op.execute("DROP FUNCTION bump_community_snapshot_sequence()")
+    op.drop_column('communities', 'snapshot_sequence')
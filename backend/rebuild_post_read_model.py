@@ -0,0 +1,41 @@
+"""Script to regenerate the post read model (post_read_model table) from the source tables.
+
+Documents are normally maintained by the API in the writing transaction; run this
+after changing the document shape or to repair drift. Posts are processed in
+primary key batches, one short transaction per batch.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.config import settings
+from app.core.database import create_workload_engine
+from app.services.post_read_model import rebuild_post_read_model
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the rebuild."""
+    engine = create_workload_engine("background")
+    try:
+        rebuilt = await rebuild_post_read_model(engine, batch_size=args.batch_size, pause_seconds=args.pause)
+    except Exception as e:
+        print(f"[ERROR] Rebuild failed: {e}")
+        return 1
+    finally:
+        await engine.dispose()
+
+    print(f"[OK] Rebuilt {rebuilt} post documents")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=settings.post_read_model_batch_size)
+    parser.add_argument("--pause", type=float, default=settings.post_read_model_pause_seconds)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(asyncio.run(run(parser.parse_args())))
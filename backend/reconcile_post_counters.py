@@ -0,0 +1,46 @@
+"""Script to check per-user post status counters (user_post_counters) against the posts table.
+
+Counters are maintained by the API in the writing transaction; this recounts every
+user's posts in batches and repairs drifted rows. Run it periodically from cron, or
+keep it running with --interval.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.config import settings
+from app.core.database import create_workload_engine
+from app.services.post_counters import reconcile_post_counters
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run one reconciliation pass, or one every --interval seconds."""
+    engine = create_workload_engine("background")
+    try:
+        while True:
+            try:
+                checked, fixed = await reconcile_post_counters(engine, batch_size=args.batch_size)
+            except Exception as e:
+                print(f"[ERROR] Reconciliation failed: {e}")
+                if not args.interval:
+                    return 1
+            else:
+                print(f"[OK] Checked {checked} users, fixed {fixed} counters")
+            if not args.interval:
+                return 0
+            await asyncio.sleep(args.interval)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=settings.post_counters_reconcile_batch_size)
+    parser.add_argument("--interval", type=float, default=0, help="Repeat every N seconds (0 - single pass)")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(asyncio.run(run(parser.parse_args())))
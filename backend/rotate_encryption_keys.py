@@ -0,0 +1,65 @@
+"""Script to re-encrypt stored community tokens with the current encryption key.
+
+Rotation procedure:
+1. Put the old key into ENCRYPTION_KEYS_PREVIOUS and the new one into ENCRYPTION_KEY.
+2. Restart the API (old tokens stay readable, new tokens use the new key).
+3. Run this script; it can be interrupted and restarted at any time.
+4. Once it reports completion, remove the old key from ENCRYPTION_KEYS_PREVIOUS.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.config import settings
+from app.core.database import create_workload_engine
+from app.services.key_rotation import rotate_encryption_keys
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the rotation job."""
+    checkpoint_path = Path(args.checkpoint)
+    if args.restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    engine = create_workload_engine("background")
+    try:
+        progress = await rotate_encryption_keys(
+            engine,
+            checkpoint_path=checkpoint_path,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+        )
+    except Exception as e:
+        print(f"[ERROR] Key rotation failed: {e}")
+        print(f"Progress is saved in {checkpoint_path}, rerun the script to resume.")
+        return 1
+    finally:
+        await engine.dispose()
+
+    checkpoint_path.unlink(missing_ok=True)
+    summary = (
+        f"scanned={progress.scanned} rotated={progress.rotated} "
+        f"skipped={progress.skipped} conflicts={progress.conflicts} failed={progress.failed}"
+    )
+    if progress.failed:
+        print(f"[ERROR] Key rotation finished with undecryptable tokens: {summary}")
+        print("Keep the previous keys until the failed communities (see the log) are fixed.")
+        return 1
+
+    print(f"[OK] Key rotation finished: {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=settings.key_rotation_batch_size)
+    parser.add_argument("--pause", type=float, default=settings.key_rotation_pause_seconds)
+    parser.add_argument("--checkpoint", default=settings.key_rotation_checkpoint_file)
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(asyncio.run(run(parser.parse_args())))
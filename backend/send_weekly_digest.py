@@ -0,0 +1,62 @@
+"""Script to send weekly analytics digest emails.
+
+Run weekly (e.g. from cron on Monday morning). Use --dry-run to write .eml files
+into the output directory instead of sending them.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.config import settings
+from app.core.database import create_workload_engine
+from app.services.digest import send_weekly_digests
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the digest job."""
+    if not args.dry_run and not settings.smtp_enabled:
+        print("[ERROR] SMTP is disabled, set SMTP_ENABLED=true or use --dry-run")
+        return 1
+
+    week_end = None
+    if args.week_end:
+        week_end = datetime.fromisoformat(args.week_end).replace(tzinfo=timezone.utc)
+
+    engine = create_workload_engine("background")
+    try:
+        stats = await send_weekly_digests(
+            engine,
+            week_end=week_end,
+            dry_run=args.dry_run,
+            output_dir=Path(args.output_dir),
+            chunk_size=args.chunk_size,
+            rate_per_second=args.rate,
+        )
+    except Exception as e:
+        print(f"[ERROR] Digest failed: {e}")
+        return 1
+    finally:
+        await engine.dispose()
+
+    print(
+        f"[OK] Digest finished: users={stats.users_scanned} sent={stats.emails_sent} "
+        f"failed={stats.emails_failed}"
+    )
+    return 0 if stats.emails_failed == 0 else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Write .eml files instead of sending")
+    parser.add_argument("--output-dir", default=settings.digest_output_dir)
+    parser.add_argument("--week-end", help="End of the reported week, YYYY-MM-DD (exclusive)")
+    parser.add_argument("--chunk-size", type=int, default=settings.digest_chunk_size)
+    parser.add_argument("--rate", type=float, default=settings.digest_rate_per_second, help="Emails per second")
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(asyncio.run(run(parser.parse_args())))
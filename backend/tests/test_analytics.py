@@ -0,0 +1,57 @@
+"""Community analytics series: trends, downsampling and timestamp serialization."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.api.analytics import metric_detail
+from app.services.timeseries import metric_series_from_rows
+
+
+def _series(points: int) -> tuple[list[datetime], np.ndarray, np.ndarray]:
+    """Aware UTC timestamps as stored, plus the datetime64 / float64 arrays the endpoint builds."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    timestamps = [start + timedelta(hours=i, microseconds=i) for i in range(points)]
+    recorded_at = np.array([t.replace(tzinfo=None) for t in timestamps], dtype="datetime64[us]")
+    values = 1000 + np.arange(points, dtype=np.float64) * 2.5
+    return timestamps, recorded_at, values
+
+
+def test_metric_detail_serializes_utc_timestamps():
+    timestamps, recorded_at, values = _series(50)
+
+    detail = metric_detail("follower_count", recorded_at, values).model_dump(mode="json")
+
+    assert all(value["recorded_at"].endswith(("Z", "+00:00")) for value in detail["values"])
+    assert [datetime.fromisoformat(value["recorded_at"]) for value in detail["values"]] == timestamps
+
+
+def test_metric_detail_downsampled_points_keep_original_timestamps():
+    timestamps, recorded_at, values = _series(1000)
+
+    detail = metric_detail("follower_count", recorded_at, values, max_points=20)
+
+    assert detail.total_points == 1000
+    assert len(detail.values) == 20
+    assert detail.values[0].recorded_at == timestamps[0]
+    assert detail.values[-1].recorded_at == timestamps[-1]
+    assert all(value.recorded_at in timestamps for value in detail.values)
+    assert detail.trend == "up"
+
+
+def test_series_from_timestamptz_rows_serialize_as_utc():
+    moscow = timezone(timedelta(hours=3))
+    rows = [
+        ("engagement_rate", datetime(2026, 1, 1, 3, tzinfo=moscow), 4.5),
+        ("engagement_rate", datetime(2026, 1, 1, 1, tzinfo=timezone.utc), 4.75),
+        ("follower_count", datetime(2026, 1, 1, 0, 0, 0, 123456, tzinfo=timezone.utc), 1200.0),
+    ]
+
+    series = metric_series_from_rows(rows)
+    details = {name: metric_detail(name, *arrays).model_dump(mode="json") for name, arrays in series.items()}
+
+    assert [value["recorded_at"] for value in details["engagement_rate"]["values"]] == [
+        "2026-01-01T00:00:00Z",
+        "2026-01-01T01:00:00Z",
+    ]
+    assert details["follower_count"]["values"] == [{"value": 1200.0, "recorded_at": "2026-01-01T00:00:00.123456Z"}]
@@ -0,0 +1,136 @@
+"""Email queue delivery against a local aiosmtpd server."""
+
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.core.config import settings
+from app.core.email import EmailQueue, SMTPConnectionPool, build_message
+
+
+class RecordingHandler:
+    """Keeps every delivered envelope and the client address of its connection."""
+
+    def __init__(self):
+        self.envelopes = []
+        self.peers = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        self.peers.add(session.peer)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FlakyHandler(RecordingHandler):
+    """Answers the first delivery attempt to every recipient with a transient 451."""
+
+    def __init__(self):
+        super().__init__()
+        self.attempted = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        recipients = tuple(envelope.rcpt_tos)
+        if recipients not in self.attempted:
+            self.attempted.add(recipients)
+            return "451 Try again later"
+        return await super().handle_DATA(server, session, envelope)
+
+
+def _serve(handler, monkeypatch):
+    """Run a local SMTP server for handler and point the settings at it."""
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    monkeypatch.setattr(settings, "smtp_host", controller.hostname)
+    monkeypatch.setattr(settings, "smtp_port", controller.port)
+    monkeypatch.setattr(settings, "smtp_use_tls", False)
+    monkeypatch.setattr(settings, "smtp_user", "")
+    monkeypatch.setattr(settings, "smtp_password", "")
+    yield handler
+    controller.stop()
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    yield from _serve(RecordingHandler(), monkeypatch)
+
+
+@pytest.fixture
+def flaky_smtp_server(monkeypatch):
+    yield from _serve(FlakyHandler(), monkeypatch)
+
+
+async def test_queue_delivers_every_message_over_pooled_connections(smtp_server, monkeypatch):
+    monkeypatch.setattr(settings, "smtp_batch_size", 5)
+    queue = EmailQueue(SMTPConnectionPool(size=2))
+    await queue.start()
+    try:
+        recipients = [f"user{i}@example.com" for i in range(30)]
+        for recipient in recipients:
+            assert queue.enqueue(build_message(recipient, "Digest", "<p>Hi</p>", "Hi"))
+        await queue.join()
+
+        # A later burst goes over the connections already open
+        for recipient in recipients[:5]:
+            assert queue.enqueue(build_message(recipient, "Digest", "<p>Hi</p>", "Hi"))
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    delivered = sorted(rcpt for envelope in smtp_server.envelopes for rcpt in envelope.rcpt_tos)
+    assert delivered == sorted(recipients + recipients[:5])
+    assert 1 <= len(smtp_server.peers) <= 2
+
+
+async def test_queue_replaces_a_dropped_idle_connection(smtp_server):
+    queue = EmailQueue(SMTPConnectionPool(size=1))
+    await queue.start()
+    try:
+        assert queue.enqueue(build_message("first@example.com", "Digest", "<p>Hi</p>"))
+        await queue.join()
+
+        # A pooled connection that died while idle is replaced on checkout
+        queue.pool._idle[0].close()
+
+        assert queue.enqueue(build_message("second@example.com", "Digest", "<p>Hi</p>"))
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    assert [envelope.rcpt_tos for envelope in smtp_server.envelopes] == [
+        ["first@example.com"],
+        ["second@example.com"],
+    ]
+    assert len(smtp_server.peers) == 2
+
+
+
+async def test_join_waits_for_pending_retries(flaky_smtp_server, monkeypatch):
+    monkeypatch.setattr(settings, "smtp_retry_backoff_seconds", 0.05)
+    queue = EmailQueue(SMTPConnectionPool(size=1))
+    await queue.start()
+    try:
+        assert queue.enqueue(build_message("retry@example.com", "Digest", "<p>Hi</p>"))
+        await queue.join()
+
+        assert [envelope.rcpt_tos for envelope in flaky_smtp_server.envelopes] == [["retry@example.com"]]
+    finally:
+        await queue.stop()
+
+
+async def test_stop_logs_dropped_retries(flaky_smtp_server, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "smtp_retry_backoff_seconds", 60)
+    queue = EmailQueue(SMTPConnectionPool(size=1))
+    await queue.start()
+    assert queue.enqueue(build_message("retry@example.com", "Digest", "<p>Hi</p>"))
+
+    await queue.stop(drain_timeout=0.5)
+
+    assert flaky_smtp_server.envelopes == []
+    assert "Dropping 1 pending email retries on shutdown" in caplog.text
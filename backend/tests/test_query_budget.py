@@ -0,0 +1,108 @@
+"""Query budgets (app.testing) on endpoints and on N+1 loops."""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+
+from app.api.calendar import require_extended_tier
+from app.api.dependencies import get_read_db
+from app.main import app
+from app.models.post import PostReadModel
+from app.models.user import User
+from app.testing import assert_query_budget
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(PostReadModel.__table__.create)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(session_factory):
+    """API client for an extended-tier user with a month of scheduled posts."""
+    user = User(id=uuid4(), email="user@example.com", subscription_tier="extended", timezone="UTC")
+    month_start = datetime.now(timezone.utc).replace(
+        day=1, hour=9, minute=0, second=0, microsecond=0
+    )
+    async with session_factory() as db:
+        for day in range(20):
+            post_id = uuid4()
+            scheduled_at = month_start + timedelta(days=day)
+            db.add(
+                PostReadModel(
+                    post_id=post_id,
+                    user_id=user.id,
+                    status="scheduled",
+                    scheduled_at=scheduled_at,
+                    created_at=month_start,
+                    document={
+                        "id": str(post_id),
+                        "content_text": f"Post {day}",
+                        "scheduled_at": scheduled_at.isoformat(),
+                        "status": "scheduled",
+                        "publications": [
+                            {
+                                "community_id": str(uuid4()),
+                                "community_name": "Group",
+                                "platform": "vk",
+                            }
+                        ],
+                    },
+                )
+            )
+        await db.commit()
+
+    async def read_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[require_extended_tier] = lambda: user
+    app.dependency_overrides[get_read_db] = read_db
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.query_budget(1)
+async def test_calendar_month_is_one_query(client):
+    response = await client.get("/api/v1/calendar")
+
+    assert response.status_code == 200
+    assert len(response.json()["posts"]) == 20
+
+
+async def test_n_plus_one_loop_is_rejected(session_factory):
+    async with session_factory() as db:
+        with pytest.raises(pytest.fail.Exception, match="N\\+1 query pattern: 6x SELECT"):
+            with assert_query_budget(10):
+                for _ in range(6):
+                    await db.execute(
+                        select(PostReadModel.document).where(PostReadModel.post_id == uuid4())
+                    )
+
+
+async def test_exceeding_the_budget_fails(session_factory):
+    async with session_factory() as db:
+        with pytest.raises(pytest.fail.Exception, match="Query budget exceeded: 3 > 2 statements"):
+            with assert_query_budget(2):
+                await db.execute(select(PostReadModel.post_id))
+                await db.execute(select(PostReadModel.document))
+                await db.execute(select(PostReadModel.status))